@@ -0,0 +1,60 @@
+# bench_audit_log.py
+"""Per-action latency and write syscalls: open/append per action vs the batched AuditLogger.
+
+Run from the repository root:  python benchmarks/bench_audit_log.py [actions]
+Write syscalls are read from /proc/self/io, so this benchmark needs Linux.
+"""
+import csv
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from audit_log import AuditLogger
+
+HEADERS = ["Username", "Role", "Action", "Login Time", "Action Time"]
+
+
+def append_per_action(log_file, row):
+    write_header = not os.path.exists(log_file)
+    with open(log_file, "a", newline="") as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(HEADERS)
+        writer.writerow(row)
+
+
+def write_syscalls():
+    with open("/proc/self/io") as f:
+        for line in f:
+            if line.startswith("syscw:"):
+                return int(line.split()[1])
+
+
+def run(label, log, n, finish=lambda: None):
+    row = ["USER001", "nurse", "Count Visits", "2025-05-18 22:11:49",
+           datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")]
+    before = write_syscalls()
+    start = time.perf_counter()
+    for _ in range(n):
+        log(row)
+    per_action = (time.perf_counter() - start) / n * 1e6
+    finish()
+    print(f"{label:12s} {per_action:8.1f} us/action  {write_syscalls() - before:7d} write syscalls")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "old.csv")
+        run("per-action", lambda row: append_per_action(path, row), n)
+        logger = AuditLogger(os.path.join(folder, "new.csv"), HEADERS)
+        run("batched", logger.log, n, logger.close)
+        with open(path) as a, open(os.path.join(folder, "new.csv")) as b:
+            assert a.read() == b.read(), "both logs must contain every row"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# bench_cohort.py
+"""Cohort counts through the bitmap index vs a naive loop over system.patients.
+
+Run from the repository root:  python benchmarks/bench_cohort.py [visits]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from synthetic_data import generate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from cohort import FIELDS, _field_value
+from patient_management import PatientManagementSystem
+
+QUERIES = [
+    ({"insurance": "Medicare", "department": "Cardiology", "age_group": "Senior",
+      "chief_complaint": "chest pain"}, "2015-01-01", "2018-12-31"),
+    ({"gender": ["Female", "Non-binary"], "race": "Asian"}, None, None),
+    ({"zip_code": "53001"}, "2010-06-01", "2010-06-30"),
+]
+
+
+def naive_count(system, filters, date_from, date_to):
+    wanted = {f: {v.lower() for v in ([vals] if isinstance(vals, str) else vals)} for f, vals in filters.items()}
+    count = 0
+    for patient in system.patients.values():
+        for visit in patient.visits:
+            if date_from and visit.visit_time < date_from or date_to and visit.visit_time > date_to:
+                continue
+            if all(str(_field_value(visit, f)).lower() in vals for f, vals in wanted.items()):
+                count += 1
+    return count
+
+
+def main():
+    n_visits = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as folder:
+        data_path = generate(folder, n_visits)[0]
+        system = PatientManagementSystem(data_path)
+        start = time.perf_counter()
+        system._cohort_index()
+        print(f"index build {time.perf_counter() - start:.2f} s over {n_visits} visits ({len(FIELDS)} fields)")
+        for filters, date_from, date_to in QUERIES:
+            start = time.perf_counter()
+            expected = naive_count(system, filters, date_from, date_to)
+            naive = (time.perf_counter() - start) * 1e3
+            system.cohort_count(filters, date_from, date_to)  # materialize bitmaps
+            start = time.perf_counter()
+            got = system.cohort_count(filters, date_from, date_to)
+            indexed = (time.perf_counter() - start) * 1e3
+            assert got == expected, (filters, got, expected)
+            print(f"{got:7d} visits  naive {naive:8.2f} ms  bitmap {indexed:7.3f} ms  {filters} {date_from}..{date_to}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# bench_credentials.py
+"""Login latency versus number of accounts, for the old linear scan and the hashed store.
+
+Run from the repository root:  python benchmarks/bench_credentials.py
+Every synthetic account shares one real scrypt hash, so building a large
+file doesn't require hashing each password.
+"""
+import csv
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from credentials import CredentialStore, hash_password
+
+
+def linear_authenticate(username, password, path):
+    with open(path, newline='') as file:
+        for row in csv.DictReader(file):
+            if row['username'] == username and row['password'] == password:
+                return row['role']
+    return None
+
+
+def write_accounts(folder, n, encoded):
+    plain = os.path.join(folder, f"plain_{n}.csv")
+    hashed = os.path.join(folder, f"hashed_{n}.csv")
+    with open(plain, "w", newline="") as p, open(hashed, "w", newline="") as h:
+        pw, hw = csv.writer(p), csv.writer(h)
+        pw.writerow(["", "username", "password", "role"])
+        hw.writerow(["", "username", "password_hash", "role"])
+        for i in range(n):
+            pw.writerow([i, f"USER{i:07d}", "secret", "nurse"])
+            hw.writerow([i, f"USER{i:07d}", encoded, "nurse"])
+    return plain, hashed
+
+
+def per_login(fn, n, repeat=20):
+    start = time.perf_counter()
+    for i in range(repeat):
+        assert fn(f"USER{(i * 7919) % n:07d}", "secret") == "nurse"
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main():
+    for n in (2 ** 13, 2 ** 14, 2 ** 15):
+        start = time.perf_counter()
+        hash_password("secret", n=n)
+        print(f"scrypt n={n:6d}: {(time.perf_counter() - start) * 1e3:7.1f} ms per hash")
+    encoded = hash_password("secret")
+    with tempfile.TemporaryDirectory() as folder:
+        for n in (1_000, 10_000, 100_000):
+            plain, hashed = write_accounts(folder, n, encoded)
+            linear = per_login(lambda u, p: linear_authenticate(u, p, plain), n, repeat=5)
+            start = time.perf_counter()
+            store = CredentialStore(hashed)
+            load = (time.perf_counter() - start) * 1e3
+            indexed = per_login(store.authenticate, n)
+            print(f"{n:7d} accounts  linear scan {linear:8.2f} ms/login"
+                  f"  hashed store {indexed:7.2f} ms/login (load {load:.0f} ms once)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# bench_dataset_cache.py
+"""Time to get a loaded system on the first login against later logins in the same process.
+
+Run from the repository root:  python benchmarks/bench_dataset_cache.py [visits] [logins]
+Each login does what the GUI's Login button does: authenticate, then ask
+shared_cache for the data. Between logins one user adds a visit, which goes
+to the journal and must not force a reload.
+"""
+import csv
+import os
+import sys
+import tempfile
+import time
+
+from synthetic_data import generate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from credentials import CredentialStore
+from dataset_cache import shared_cache
+
+
+def main():
+    n_visits = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    logins = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    with tempfile.TemporaryDirectory() as folder:
+        data_path, notes_path, credentials_path = generate(folder, n_visits)
+        store = CredentialStore(credentials_path)
+        with open(credentials_path, newline="") as f:
+            users = [(row["username"], row["password"]) for row in csv.DictReader(f)][:logins]
+        print(f"{n_visits} visits, {logins} logins")
+        first = None
+        for n, (username, password) in enumerate(users, 1):
+            start = time.perf_counter()
+            assert store.authenticate(username, password) is not None
+            system = shared_cache.get(data_path, notes_path)
+            elapsed = time.perf_counter() - start
+            first = first or elapsed
+            print(f"login {n}  {elapsed * 1000:10.2f} ms  {first / elapsed:8.0f}x  ({shared_cache.summary()})")
+            system.add_visit_gui(f"9{n}", "2024-01-02", "Cardiology", "Female", "Asian", 40,
+                                 "Hispanic", "Medicare", "53401", "fever")
+        assert shared_cache.misses == 1, shared_cache.summary()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# bench_dates.py
+"""review_date and loading with the memoized date parser and Visit.visit_date, against re-parsing strings.
+
+Run from the repository root:  python benchmarks/bench_dates.py [visits]
+"before" is the original review_date: a scan that runs the three-format
+strptime parser on every visit's date string. The scans after it show what
+memoizing the parser and comparing the stored date each buy; the indexed
+review_date is what PatientManagementSystem now uses.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from bench_indexes import timed
+from synthetic_data import generate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import patient_management
+from dates import parse_date
+from patient_management import PatientManagementSystem
+
+uncached_parse_date = parse_date.__wrapped__
+
+
+def scan(system, date_str, parse):
+    target = parse(date_str)
+    return sum(1 for _, visit in system.iter_visits() if parse(visit.visit_time) == target)
+
+
+def scan_visit_date(system, date_str):
+    target = parse_date(date_str)
+    return sum(1 for _, visit in system.iter_visits() if visit.visit_date == target)
+
+
+def load(data_path):
+    parse_date.cache_clear()
+    start = time.perf_counter()
+    system = PatientManagementSystem(data_path)
+    return time.perf_counter() - start, system
+
+
+def main():
+    n_visits = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as folder:
+        data_path = generate(folder, n_visits)[0]
+
+        patient_management.parse_date = uncached_parse_date
+        try:
+            load_before, _ = load(data_path)
+        finally:
+            patient_management.parse_date = parse_date
+        load_after, system = load(data_path)
+        info = parse_date.cache_info()
+        print(f"load_data          before {load_before:7.2f} s  after {load_after:7.2f} s  "
+              f"(parser cache hit rate {info.hits / (info.hits + info.misses):.1%})")
+
+        date_str = next(system.iter_visits())[1].visit_time
+        before, expected = timed(scan, system, date_str, uncached_parse_date, repeat=3)
+        print(f"review_date {date_str}: {expected} visits")
+        print(f"  strptime scan    {before * 1000:10.2f} ms")
+        for label, fn, args in (("memoized scan", scan, (system, date_str, parse_date)),
+                                ("visit_date scan", scan_visit_date, (system, date_str)),
+                                ("indexed", system.review_date, (date_str,))):
+            elapsed, count = timed(fn, *args)
+            assert count == expected, (label, count, expected)
+            print(f"  {label:16s} {elapsed * 1000:10.3f} ms  {before / elapsed:10.0f}x")
+
+
+if __name__ == "__main__":
+    main()
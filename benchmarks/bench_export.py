@@ -0,0 +1,52 @@
+# bench_export.py
+"""Bulk export throughput (records/sec) per format, and peak memory against export size.
+
+Run from the repository root:  python benchmarks/bench_export.py [visits]
+Peak memory is the tracemalloc high-water mark while exporting, so it counts
+only what the export allocates on top of the loaded data: buffers, one
+record at a time, and the set of IDs already written (used to skip repeats).
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from synthetic_data import generate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from patient_management import PatientManagementSystem
+
+
+def main():
+    n_visits = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as folder:
+        data_path, notes_path, _ = generate(folder, n_visits)
+        system = PatientManagementSystem(data_path)
+        system.load_notes(notes_path)
+        ids = list(system.patients)
+        print(f"{len(ids)} patients, {n_visits} visits")
+
+        for name in ("out.txt", "out.csv", "out.jsonl", "out.jsonl.gz"):
+            path = os.path.join(folder, name)
+            start = time.perf_counter()
+            count = system.export_patients(path, patient_ids=ids)
+            elapsed = time.perf_counter() - start
+            print(f"{name:13s} {count / elapsed:10.0f} records/s  {os.path.getsize(path) / 2**20:7.1f} MB")
+
+        start = time.perf_counter()
+        count = system.export_patients(os.path.join(folder, "cohort.csv"),
+                                       filters={"insurance": ["Medicare"]}, date_from="2010-01-01")
+        print(f"cohort csv    {count / (time.perf_counter() - start):10.0f} records/s  ({count} patients)")
+
+        for share in (8, 4, 2, 1):
+            subset = ids[:len(ids) // share]
+            tracemalloc.start()
+            system.export_patients(os.path.join(folder, "mem.jsonl"), patient_ids=subset)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{len(subset):8d} patients  peak {peak / 2**20:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# bench_indexes.py
+"""Compare indexed review_date/view_note against the old full scans.
+
+Run from the repository root:  python benchmarks/bench_indexes.py [visits]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from synthetic_data import generate
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from patient_management import PatientManagementSystem
+
+
+def scan_review_date(system, date_str):
+    target = system._parse_date(date_str)
+    count = 0
+    for patient in system.patients.values():
+        for visit in patient.visits:
+            if system._parse_date(visit.visit_time) == target:
+                count += 1
+    return count
+
+
+def scan_view_note(system, patient_id, date_str):
+    target = system._parse_date(date_str)
+    results = []
+    for visit in system.patients[patient_id].visits:
+        if system._parse_date(visit.visit_time) == target:
+            for note in system.patients[patient_id].notes:
+                if note.visit_id == visit.visit_id:
+                    results.append(f"Note ID: {note.note_id}\n{note.note_text}")
+    return "\n\n".join(results) if results else None
+
+
+def timed(fn, *args, repeat=5):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    n_visits = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as folder:
+        data_path, notes_path, _ = generate(folder, n_visits)
+        system = PatientManagementSystem(data_path)
+        system.load_notes(notes_path)
+
+        pid, patient = next(iter(system.patients.items()))
+        date_str = patient.visits[0].visit_time
+
+        t_scan, n_scan = timed(scan_review_date, system, date_str, repeat=1)
+        t_idx, n_idx = timed(system.review_date, date_str)
+        assert n_scan == n_idx, (n_scan, n_idx)
+        print(f"review_date  scan {t_scan * 1e3:10.3f} ms  indexed {t_idx * 1e3:8.4f} ms  ({n_idx} visits)")
+
+        t_scan, v_scan = timed(scan_view_note, system, pid, date_str)
+        t_idx, v_idx = timed(system.view_note, pid, date_str)
+        assert v_scan == v_idx
+        print(f"view_note    scan {t_scan * 1e3:10.3f} ms  indexed {t_idx * 1e3:8.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
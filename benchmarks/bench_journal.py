@@ -0,0 +1,60 @@
+# bench_journal.py
+"""Latency of sequential remove_patient calls with the journal vs full rewrites.
+
+Run from the repository root:  python benchmarks/bench_journal.py [visits] [removals]
+The rewrite path is what remove_patient did before the journal; it is timed on
+a sample of removals and extrapolated, since the full run takes too long.
+"""
+import csv
+import os
+import sys
+import tempfile
+import time
+
+from synthetic_data import generate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from patient_management import PatientManagementSystem
+
+
+def rewrite_remove(path, pid):
+    with open(path, 'r', newline='') as f:
+        rows = list(csv.DictReader(f))
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=rows[0].keys() if rows else [])
+        writer.writeheader()
+        for row in rows:
+            if row['Patient_ID'].strip() != pid:
+                writer.writerow(row)
+
+
+def main():
+    n_visits = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    n_removals = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    with tempfile.TemporaryDirectory() as folder:
+        data_path = generate(folder, n_visits)[0]
+        system = PatientManagementSystem(data_path)
+        pids = list(system.patients)[:n_removals]
+
+        start = time.perf_counter()
+        for pid in pids:
+            system.remove_patient(pid)
+        journal = time.perf_counter() - start
+
+        start = time.perf_counter()
+        system.compact()
+        compact = time.perf_counter() - start
+
+        sample = pids[:min(10, len(pids))]
+        start = time.perf_counter()
+        for pid in sample:
+            rewrite_remove(data_path, pid)
+        rewrite = (time.perf_counter() - start) / len(sample)
+
+    print(f"journal  {journal / len(pids) * 1e3:9.3f} ms/removal  {journal:8.2f} s for {len(pids)}")
+    print(f"rewrite  {rewrite * 1e3:9.3f} ms/removal  {rewrite * len(pids):8.2f} s for {len(pids)} (extrapolated)")
+    print(f"compaction of {len(pids)} journaled removals: {compact:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
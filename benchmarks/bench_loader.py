@@ -0,0 +1,48 @@
+# bench_loader.py
+"""Compare load time and peak RSS of the row and columnar loaders.
+
+Run from the repository root:  python benchmarks/bench_loader.py [visits]
+Each loader runs in its own subprocess so peak RSS is measured separately.
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic_data import generate
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+def run_loader(loader, data_path):
+    """Load data_path with the given loader and print 'seconds peak_kb'."""
+    sys.path.insert(0, SRC)
+    from patient_management import PatientManagementSystem
+    start = time.perf_counter()
+    system = PatientManagementSystem(data_path, loader=loader)
+    elapsed = time.perf_counter() - start
+    visits = sum(len(p.visits) for p in system.patients.values())
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(elapsed, peak, visits)
+
+
+def main():
+    n_visits = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as folder:
+        data_path = generate(folder, n_visits)[0]
+        for loader in ("rows", "columnar"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", loader, data_path],
+                check=True, capture_output=True, text=True
+            ).stdout.split()
+            elapsed, peak, visits = float(out[0]), int(out[1]), int(out[2])
+            print(f"{loader:9s} {elapsed:8.2f} s  peak RSS {peak / 1024:8.1f} MB  ({visits} visits)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        run_loader(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -0,0 +1,89 @@
+# bench_memory.py
+"""Report bytes per visit for the loaded model, before and after slotting/interning.
+
+Run from the repository root:  python benchmarks/bench_memory.py [visits]
+"before" swaps in dict-based copies of the model classes and disables string
+interning, which is how load_data built the model previously.
+"""
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+from synthetic_data import generate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+import patient_management
+from patient_management import PatientManagementSystem
+
+
+class LegacyVisit:
+    def __init__(self, visit_id, visit_date, department, gender, race, age, ethnicity, insurance, zip_code, chief_complaint):
+        self.visit_id = visit_id
+        self.visit_time = visit_date.isoformat()  # one string per row, as read from the CSV
+        self.department = department
+        self.gender = gender
+        self.race = race
+        self.age = age
+        self.ethnicity = ethnicity
+        self.insurance = insurance
+        self.zip_code = zip_code
+        self.chief_complaint = chief_complaint
+
+
+class LegacyPatient:
+    def __init__(self, patient_id):
+        self.patient_id = patient_id
+        self.visits = []
+        self.notes = []
+
+    def add_visit(self, visit):
+        self.visits.append(visit)
+
+
+class LegacyDepartment:
+    def __init__(self, name):
+        self.name = name
+        self.patients = set()
+
+    def add_patient(self, patient):
+        self.patients.add(patient)
+
+
+def measure(data_path):
+    gc.collect()
+    tracemalloc.start()
+    system = PatientManagementSystem(data_path)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    visits = sum(len(p.visits) for p in system.patients.values())
+    del system
+    gc.collect()
+    return current / visits
+
+
+def main():
+    n_visits = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as folder:
+        data_path = generate(folder, n_visits)[0]
+
+        saved = (patient_management.Visit, patient_management.Patient,
+                 patient_management.Department, patient_management.intern)
+        patient_management.Visit = LegacyVisit
+        patient_management.Patient = LegacyPatient
+        patient_management.Department = LegacyDepartment
+        patient_management.intern = lambda s: s
+        try:
+            before = measure(data_path)
+        finally:
+            (patient_management.Visit, patient_management.Patient,
+             patient_management.Department, patient_management.intern) = saved
+        after = measure(data_path)
+
+    print(f"before {before:8.1f} bytes/visit")
+    print(f"after  {after:8.1f} bytes/visit  ({100 * (1 - after / before):.1f}% smaller)")
+
+
+if __name__ == "__main__":
+    main()
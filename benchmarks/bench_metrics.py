@@ -0,0 +1,78 @@
+# bench_metrics.py
+"""Cost of the metrics layer per call, disabled and enabled.
+
+Run from the repository root:  python benchmarks/bench_metrics.py [visits]
+First times a decorated function in-process, then review_date over a
+synthetic dataset in subprocesses with and without PMS_METRICS=1.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic_data import generate
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+from metrics import Metrics
+
+CALLS = 1_000_000
+
+
+def per_call_ns(fn, calls=CALLS):
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return best / calls * 1e9
+
+
+def noop():
+    return 1
+
+
+def run_queries(data_path, queries):
+    """Time review_date over the dataset's dates and print ns per call."""
+    from patient_management import PatientManagementSystem
+    system = PatientManagementSystem(data_path)
+    dates = sorted({visit.visit_time for _, visit in system.iter_visits()})
+    dates = (dates * (queries // len(dates) + 1))[:queries]
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        for date in dates:
+            system.review_date(date)
+        best = min(best, time.perf_counter() - start)
+    print(best / queries * 1e9)
+
+
+def main():
+    n_visits = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    disabled = Metrics(enabled=False).timed("noop")(noop)
+    assert disabled is noop, "disabled metrics must not wrap"
+    enabled = Metrics(enabled=True, folder=tempfile.mkdtemp()).timed("noop")(noop)
+    base = per_call_ns(noop)
+    print(f"no-op function    plain {base:6.0f} ns  disabled {per_call_ns(disabled):6.0f} ns  "
+          f"enabled {per_call_ns(enabled):6.0f} ns")
+
+    with tempfile.TemporaryDirectory() as folder:
+        data_path = generate(folder, n_visits)[0]
+        times = {}
+        for label, value in (("disabled", ""), ("enabled", "1")):
+            env = dict(os.environ, PMS_METRICS=value, PMS_METRICS_DIR=folder)
+            out = subprocess.run([sys.executable, __file__, "--child", data_path, "20000"],
+                                 env=env, check=True, capture_output=True, text=True).stdout
+            times[label] = float(out.split()[-1])
+        overhead = times["enabled"] / times["disabled"] - 1
+        print(f"review_date       disabled {times['disabled']:6.0f} ns  enabled {times['enabled']:6.0f} ns  "
+              f"({overhead:+.1%} when enabled)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        run_queries(sys.argv[2], int(sys.argv[3]))
+    else:
+        main()
@@ -0,0 +1,59 @@
+# bench_notes.py
+"""Compare eager and lazy (memory-mapped) load_notes: load time and resident memory.
+
+Run from the repository root:  python benchmarks/bench_notes.py [notes]
+Each mode runs in its own subprocess; resident memory is read from
+/proc/self/statm, so this benchmark needs Linux.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic_data import generate
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+# Notes about 1.5 KB long (median), some split over several lines.
+NOTE_CHARS = 1500
+
+
+def resident_bytes():
+    """Return (resident, anonymous) bytes; anonymous excludes file-backed pages."""
+    with open("/proc/self/statm") as f:
+        _, resident, shared = (int(x) for x in f.read().split()[:3])
+    page = os.sysconf("SC_PAGE_SIZE")
+    return resident * page, (resident - shared) * page
+
+
+def run_mode(mode, data_path, notes_path):
+    sys.path.insert(0, SRC)
+    from patient_management import PatientManagementSystem
+    system = PatientManagementSystem(data_path)
+    before = resident_bytes()
+    start = time.perf_counter()
+    system.load_notes(notes_path, lazy=(mode == "lazy"))
+    elapsed = time.perf_counter() - start
+    after = resident_bytes()
+    print(elapsed, after[0] - before[0], after[1] - before[1])
+
+
+def main():
+    n_notes = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as folder:
+        data_path, notes_path, _ = generate(folder, n_notes, note_chars=NOTE_CHARS)
+        print(f"Notes.csv: {os.path.getsize(notes_path) / 2**20:.1f} MB, {n_notes} notes")
+        for mode in ("eager", "lazy"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, data_path, notes_path],
+                check=True, capture_output=True, text=True
+            ).stdout.split()
+            print(f"{mode:6s} load {float(out[0]):7.2f} s  resident +{int(out[1]) / 2**20:7.1f} MB"
+                  f"  (anonymous +{int(out[2]) / 2**20:7.1f} MB)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        run_mode(*sys.argv[2:])
+    else:
+        main()
@@ -0,0 +1,101 @@
+# bench_parallel_loader.py
+"""Check the parallel loader builds the same model as the row loader, then time it for 1/2/4/8 workers.
+
+Run from the repository root:  python benchmarks/bench_parallel_loader.py [visits]
+The parity check splits a small file (with bad dates, bad ages and quoted
+newlines) into many ranges; the scaling run loads each configuration in its
+own subprocess.
+"""
+import contextlib
+import csv
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from synthetic_data import generate
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+sys.path.insert(0, SRC)
+import parallel_loader
+from patient_management import PatientManagementSystem
+
+
+def write_awkward(folder, n_visits):
+    """Synthetic data plus rows the loaders must skip or keep intact."""
+    data_path = generate(folder, n_visits)[0]
+    with open(data_path, "a", newline="") as f:
+        writer = csv.writer(f)
+        for i in range(0, n_visits, max(1, n_visits // 20)):
+            writer.writerow([str(10000 + i), f"9{i}", "2019-13-45", "Cardiology", "Asian", "Male",
+                             "Hispanic", "40", "53401", "Medicare", "fever", f"6{i}", "progress note"])
+            writer.writerow([str(10000 + i), f"8{i}", "2019-02-03", "Neurology", "Asian", "Female",
+                             "Hispanic", "forty", "53401", "Medicare", "fever", f"5{i}", "progress note"])
+            writer.writerow([str(90000 + i), f"7{i}", "03/04/2018", "Oncology", "Asian", "Female",
+                             "Hispanic", " 52 ", "53401", "Private", "cough\n\"dry\", at night", f"4{i}",
+                             "progress note"])
+            writer.writerow([])
+    return data_path
+
+
+def snapshot(system):
+    """Everything the loaders build, in comparable form."""
+    return (
+        [(pid, [(v.visit_id, v.visit_time, v.department.name, v.gender, v.race, v.age, v.ethnicity,
+                 v.insurance, v.zip_code, v.chief_complaint) for v in p.visits])
+         for pid, p in system.patients.items()],
+        [(name, sorted(p.patient_id for p in d.patients)) for name, d in system.departments.items()],
+        sorted((date, pid, [v.visit_id for v in visits])
+               for date, by_pid in system.visits_by_date.items() for pid, visits in by_pid.items()),
+        system.stats.snapshot(),
+        system.version,
+    )
+
+
+def load(data_path, **options):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        system = PatientManagementSystem(data_path, **options)
+    return snapshot(system), out.getvalue()
+
+
+def check_parity(folder):
+    data_path = write_awkward(folder, 5000)
+    expected = load(data_path)
+    parallel_loader.MIN_RANGE_BYTES = 4096
+    for workers in (1, 2, 4):
+        assert load(data_path, loader="parallel", workers=workers) == expected, f"{workers} workers differ"
+    parallel_loader.MIN_RANGE_BYTES = 1 << 20
+    print(f"parity OK: {len(expected[0][0])} patients, {expected[1].count('Warning')} warnings")
+
+
+def run_loader(data_path, loader, workers):
+    """Load data_path and print its load time in seconds."""
+    start = time.perf_counter()
+    PatientManagementSystem(data_path, loader=loader, workers=workers)
+    print(time.perf_counter() - start)
+
+
+def main():
+    n_visits = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as folder:
+        check_parity(folder)
+        data_path = generate(folder, n_visits)[0]
+        print(f"{n_visits} visits, {os.path.getsize(data_path) / 2**20:.0f} MB, {os.cpu_count()} CPUs")
+        baseline = None
+        for loader, workers in (("rows", 0), ("parallel", 1), ("parallel", 2), ("parallel", 4), ("parallel", 8)):
+            out = subprocess.run([sys.executable, __file__, "--child", data_path, loader, str(workers)],
+                                 check=True, capture_output=True, text=True).stdout
+            elapsed = float(out.split()[-1])
+            baseline = baseline or elapsed
+            label = loader if loader == "rows" else f"{loader} x{workers}"
+            print(f"{label:12s} {elapsed:7.2f} s  {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--child":
+        run_loader(sys.argv[2], sys.argv[3], int(sys.argv[4]) or None)
+    else:
+        main()
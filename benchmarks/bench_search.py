@@ -0,0 +1,56 @@
+# bench_search.py
+"""Build, persist and query the note index on a synthetic corpus.
+
+Run from the repository root:  python benchmarks/bench_search.py [notes]
+Notes draw words from a Zipf-like vocabulary so common and rare terms both occur.
+"""
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from note_search import NoteIndex
+
+CLINICAL = ["meningitis", "ceftazidime", "sepsis", "pneumonia", "fracture", "insulin",
+            "seizure", "biopsy", "hypertension", "amikacin"]
+
+
+def write_corpus(folder, n_notes, seed=0):
+    rng = random.Random(seed)
+    vocab = CLINICAL + [f"w{i}" for i in range(5000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    rng.shuffle(weights)
+    path = os.path.join(folder, "Notes.csv")
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["", "Patient_ID", "Visit_ID", "Note_ID", "Note_text"])
+        for i in range(n_notes):
+            words = rng.choices(vocab, weights, k=rng.randint(80, 250))
+            writer.writerow([i, 10000 + i // 4, 100000 + i, 500000 + i, " ".join(words)])
+    return path
+
+
+def main():
+    n_notes = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as folder:
+        path = write_corpus(folder, n_notes)
+        start = time.perf_counter()
+        NoteIndex.load_or_build(path)
+        print(f"build + save {time.perf_counter() - start:7.2f} s  ({n_notes} notes)")
+        start = time.perf_counter()
+        index = NoteIndex.load_or_build(path)
+        print(f"load saved   {time.perf_counter() - start:7.2f} s")
+        for query in ("meningitis", "ceftazidime amikacin", "sepsis pneumonia insulin", "w1 w2 w3"):
+            start = time.perf_counter()
+            for _ in range(10):
+                hits = index.search(query)
+            elapsed = (time.perf_counter() - start) / 10 * 1e3
+            matched = sum(len(index.postings.get(t, ((),))[0]) for t in query.split())
+            print(f"{query!r:28s} {elapsed:8.2f} ms  ({matched} postings, top score {hits[0][0]:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# bench_sqlite.py
+"""Check the SQLite backend against the CSV backend and compare query latency.
+
+Run from the repository root:  python benchmarks/bench_sqlite.py [visits]
+Exits with an AssertionError if the two backends disagree.
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from synthetic_data import generate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from patient_management import PatientManagementSystem
+from sqlite_store import import_csv
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def check_parity(csv_system, db_system, pids, dates, folder):
+    for date in dates:
+        assert csv_system.review_date(date) == db_system.review_date(date), date
+    for pid in pids:
+        patient = csv_system.patients.get(pid)
+        own_dates = [v.visit_time for v in patient.visits] if patient else []
+        for date in dates[:5] + own_dates:
+            assert csv_system.view_note(pid, date) == db_system.view_note(pid, date), (pid, date)
+        a, b = os.path.join(folder, "a.txt"), os.path.join(folder, "b.txt")
+        ok = csv_system.retrieve_patient(pid, a)
+        assert ok == db_system.retrieve_patient(pid, b), pid
+        if ok:
+            assert read(a) == read(b), pid
+    assert csv_system.stats.snapshot() == db_system.store.stats().snapshot()
+
+
+def per_call(fn, args_list):
+    start = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    return (time.perf_counter() - start) / len(args_list) * 1e3
+
+
+def main():
+    n_visits = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as folder:
+        data_path, notes_path, _ = generate(folder, n_visits)
+        db_path = os.path.join(folder, "patients.db")
+        start = time.perf_counter()
+        import_csv(data_path, notes_path, db_path)
+        print(f"import {time.perf_counter() - start:.2f} s")
+
+        csv_copy = os.path.join(folder, "csv_backend.csv")
+        shutil.copy(data_path, csv_copy)
+        start = time.perf_counter()
+        csv_system = PatientManagementSystem(csv_copy)
+        csv_system.load_notes(notes_path)
+        csv_startup = time.perf_counter() - start
+        start = time.perf_counter()
+        db_system = PatientManagementSystem(db_path, backend="sqlite")
+        db_startup = time.perf_counter() - start
+        print(f"startup csv {csv_startup * 1e3:.1f} ms  sqlite {db_startup * 1e3:.1f} ms")
+
+        pids = rng.sample(sorted(csv_system.patients), 20) + ["missing"]
+        dates = sorted({v.visit_time for p in csv_system.patients.values() for v in p.visits})
+        dates = rng.sample(dates, 20) + ["1999-01-01", "not a date"]
+        check_parity(csv_system, db_system, pids, dates, folder)
+
+        for system in (csv_system, db_system):
+            for pid in pids[:5]:
+                system.remove_patient(pid)
+            system.add_visit_gui(pids[6], "2021-03-04", "Cardiology", "Female", "Asian", 70,
+                                 "Hispanic", "Medicare", "53449", "Chest Pain")
+        # add_visit_gui generates a fresh Visit_ID on each backend, so compare
+        # everything except the new visit's retrieve output.
+        check_parity(csv_system, db_system, pids[:6] + pids[7:], dates, folder)
+        assert csv_system.review_date("2021-03-04") == db_system.review_date("2021-03-04")
+        print("CSV and SQLite backends agree")
+
+        out = os.path.join(folder, "out.txt")
+        for name, system in (("csv", csv_system), ("sqlite", db_system)):
+            stats = system.store.stats if system.store else (lambda: system.stats)
+            print(f"{name:6s} review_date {per_call(system.review_date, [(d,) for d in dates]):8.3f} ms"
+                  f"  view_note {per_call(system.view_note, [(p, dates[0]) for p in pids]):8.3f} ms"
+                  f"  retrieve {per_call(system.retrieve_patient, [(p, out) for p in pids]):8.3f} ms"
+                  f"  stats {per_call(stats, [()]):8.3f} ms")
+        db_system.store.close()
+
+
+if __name__ == "__main__":
+    main()
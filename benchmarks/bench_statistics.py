@@ -0,0 +1,44 @@
+# bench_statistics.py
+"""Time repeated generate_statistics calls and check the running counts.
+
+Run from the repository root:  python benchmarks/bench_statistics.py [visits]
+The chart is written to a temporary output/ folder, not the project's.
+"""
+import os
+import sys
+import tempfile
+import time
+
+from synthetic_data import generate
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+from patient_management import PatientManagementSystem
+from visit_stats import VisitStats
+
+
+def main():
+    n_visits = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as folder:
+        data_path = generate(folder, n_visits)[0]
+        os.makedirs(os.path.join(folder, "output"))
+        os.chdir(folder)
+        system = PatientManagementSystem(data_path)
+
+        start = time.perf_counter()
+        VisitStats.from_patients(system.patients)
+        print(f"full recompute      {(time.perf_counter() - start) * 1e3:9.2f} ms")
+        for label in ("first render", "unchanged repeat"):
+            start = time.perf_counter()
+            system.generate_statistics()
+            print(f"{label:18s}  {(time.perf_counter() - start) * 1e3:9.2f} ms")
+
+        for pid in list(system.patients)[:50]:
+            system.remove_patient(pid)
+        system.add_visit_gui("1", "2020-01-01", "Cardiology", "Female", "Asian", 70,
+                             "Hispanic", "Medicare", "53449", "Chest pain")
+        assert system.stats.snapshot() == VisitStats.from_patients(system.patients).snapshot()
+        print("running counts match a full recompute")
+
+
+if __name__ == "__main__":
+    main()
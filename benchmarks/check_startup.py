@@ -0,0 +1,59 @@
+# check_startup.py
+"""Startup check for the headless CLI: no GUI or plotting imports, bounded import time.
+
+Run from the repository root:  python benchmarks/check_startup.py [budget_ms]
+Parses `python -X importtime` output for `cli.py --help` and for importing
+patient_management, and exits non-zero if tkinter or matplotlib is imported
+or the cumulative import time exceeds the budget (default 300 ms).
+"""
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+FORBIDDEN = ("tkinter", "_tkinter", "matplotlib", "numpy")
+
+
+def import_times(args):
+    """Return ({top-level module: cumulative microseconds}, every module imported, exit status)."""
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=SRC,
+                            capture_output=True, text=True)
+    times = {}
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name[1:].rstrip()  # nested imports are indented past the separator space
+        imported.add(name.strip())
+        if not name.startswith(" "):
+            times[name] = times.get(name, 0) + int(cumulative)
+    return times, imported, result.returncode
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 300.0
+    failed = False
+    for label, args in (("cli.py --help", ["cli.py", "--help"]),
+                        ("import patient_management", ["-c", "import patient_management"])):
+        times, imported, returncode = import_times(args)
+        total_ms = sum(times.values()) / 1000
+        heavy = sorted(times.items(), key=lambda item: item[1], reverse=True)[:5]
+        print(f"{label}: {total_ms:.1f} ms of imports, {len(times)} top-level modules")
+        for name, us in heavy:
+            print(f"  {us / 1000:7.1f} ms  {name}")
+        forbidden = sorted(name for name in imported if name.split(".")[0] in FORBIDDEN)
+        if returncode != 0:
+            print(f"  FAIL: exited with status {returncode}")
+            failed = True
+        if forbidden:
+            print(f"  FAIL: imported {', '.join(forbidden)}")
+            failed = True
+        if total_ms > budget_ms:
+            print(f"  FAIL: over the {budget_ms:.0f} ms budget")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
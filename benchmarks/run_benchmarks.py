@@ -0,0 +1,186 @@
+# run_benchmarks.py
+"""Time every PatientManagementSystem operation on seeded synthetic data and save the results as JSON.
+
+Run from the repository root:
+    python benchmarks/run_benchmarks.py [--visits 10000 100000 ...] [--out FILE] [--compare OLD.json]
+
+Each size runs in a fresh subprocess. Every operation records wall time and
+the process's peak RSS afterwards; --trace adds the tracemalloc peak of the
+operation itself (slower). Results go to benchmarks/results/<commit>.json
+by default. --compare prints the time ratio against an earlier results file
+and exits non-zero if any operation got slower than --tolerance allows.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from synthetic_data import generate
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(HERE, "..", "src")
+QUERIES = 200
+REMOVALS = 50
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Recorder:
+    """Collects one result dict per timed operation."""
+    def __init__(self, visits, trace):
+        self.visits = visits
+        self.trace = trace
+        self.results = []
+
+    def time(self, operation, fn, calls=1):
+        if self.trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            value = fn()
+        except ImportError as e:  # e.g. matplotlib for generate_statistics
+            self.results.append({"visits": self.visits, "operation": operation, "skipped": str(e)})
+            return None
+        finally:
+            elapsed = time.perf_counter() - start
+            traced_peak = tracemalloc.get_traced_memory()[1] if self.trace else None
+            if self.trace:
+                tracemalloc.stop()
+        result = {"visits": self.visits, "operation": operation, "seconds": elapsed, "calls": calls,
+                  "per_call_ms": elapsed / calls * 1000, "peak_rss_mb": _peak_rss_mb()}
+        if self.trace:
+            result["traced_peak_mb"] = traced_peak / 2**20
+        self.results.append(result)
+        return value
+
+
+def run_size(folder, visits, loader, trace):
+    """Benchmark one generated dataset; returns the list of result dicts."""
+    sys.path.insert(0, SRC)
+    from patient_management import PatientManagementSystem
+    data_path = os.path.join(folder, "Patient_data.csv")
+    notes_path = os.path.join(folder, "Notes.csv")
+    os.makedirs(os.path.join(folder, "output"), exist_ok=True)
+    os.chdir(folder)  # generate_statistics writes output/visit_stats.png
+    rng = random.Random(1)
+    rec = Recorder(visits, trace)
+
+    system = rec.time("load_data", lambda: PatientManagementSystem(data_path, loader=loader))
+    rec.time("load_notes", lambda: system.load_notes(notes_path))
+
+    visits_sample = rng.sample(list(system.iter_visits()), min(QUERIES, visits))
+    dates = [visit.visit_time for _, visit in visits_sample]
+    rec.time("review_date", lambda: [system.review_date(d) for d in dates], len(dates))
+    pairs = [(pid, visit.visit_time) for pid, visit in visits_sample]
+    rec.time("view_note", lambda: [system.view_note(pid, d) for pid, d in pairs], len(pairs))
+    queries = ["chest pain", "infection fever", "biopsy tumour resection", "blood pressure stable"]
+    rec.time("search_notes", lambda: [system.search_notes(q) for q in queries], len(queries))
+    rec.time("cohort_count_first", lambda: system.cohort_count({"insurance": ["Medicare"]}))
+    filters = [{"insurance": ["Medicare"]}, {"department": ["Pediatrics"], "age_group": ["Senior"]},
+               {"gender": ["Female"], "race": ["Asian", "Black"]}]
+    rec.time("cohort_count", lambda: [system.cohort_count(f, "2010-01-01", "2019-12-31") for f in filters],
+             len(filters))
+    rec.time("generate_statistics", system.generate_statistics)
+    rec.time("generate_statistics_unchanged", system.generate_statistics)
+    pids = rng.sample(sorted(system.patients), min(REMOVALS, len(system.patients)))
+    rec.time("remove_patient", lambda: [system.remove_patient(pid) for pid in pids], len(pids))
+    rec.time("compact", system.compact)
+    return rec.results
+
+
+def compare(results, trace, baseline_path, tolerance):
+    """Print time ratios against a baseline file; return True if nothing regressed."""
+    with open(baseline_path) as f:
+        saved = json.load(f)
+    if saved.get("trace", False) != trace:
+        print("\nWarning: only one of the runs used --trace, which slows every operation down.")
+    baseline = {(r["visits"], r["operation"]): r for r in saved["results"] if "seconds" in r}
+    ok = True
+    print(f"\n{'visits':>9s}  {'operation':30s} {'before ms':>11s} {'after ms':>11s}  ratio")
+    for r in results:
+        old = baseline.get((r["visits"], r["operation"]))
+        if old is None or "seconds" not in r:
+            continue
+        ratio = r["per_call_ms"] / old["per_call_ms"] if old["per_call_ms"] else float("inf")
+        flag = "  SLOWER" if ratio > tolerance else ""
+        ok = ok and not flag
+        print(f"{r['visits']:9d}  {r['operation']:30s} {old['per_call_ms']:11.3f} {r['per_call_ms']:11.3f}  "
+              f"{ratio:5.2f}{flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--visits", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--note-chars", type=int, default=600)
+    parser.add_argument("--loader", default="rows", choices=("rows", "columnar", "parallel"))
+    parser.add_argument("--trace", action="store_true", help="also record tracemalloc peaks (slower)")
+    parser.add_argument("--data-dir", help="keep generated datasets here and reuse them between runs")
+    parser.add_argument("--out", help="results file (default benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="slowdown ratio that counts as a regression")
+    args = parser.parse_args()
+
+    commit = _commit()
+    results = []
+    with tempfile.TemporaryDirectory() as scratch:
+        for visits in args.visits:
+            source = os.path.join(args.data_dir or scratch, f"visits-{visits}-seed-{args.seed}-notes-{args.note_chars}")
+            if not os.path.exists(os.path.join(source, "Credentials.csv")):
+                print(f"generating {visits} visits ...", flush=True)
+                generate(source, visits, args.seed, args.note_chars)
+            # Work on a copy: remove_patient and compact rewrite the data files.
+            folder = os.path.join(scratch, f"run-{visits}")
+            os.makedirs(folder)
+            for name in ("Patient_data.csv", "Notes.csv"):
+                shutil.copyfile(os.path.join(source, name), os.path.join(folder, name))
+            out = subprocess.run([sys.executable, __file__, "--child", folder, str(visits), args.loader,
+                                  "1" if args.trace else "0"], check=True, capture_output=True, text=True).stdout
+            size_results = json.loads(out.splitlines()[-1])
+            for r in size_results:
+                if "seconds" in r:
+                    print(f"{visits:9d}  {r['operation']:30s} {r['per_call_ms']:11.3f} ms/call  "
+                          f"peak RSS {r['peak_rss_mb']:8.1f} MB")
+                else:
+                    print(f"{visits:9d}  {r['operation']:30s} skipped ({r['skipped']})")
+            results.extend(size_results)
+
+    out_path = args.out or os.path.join(HERE, "results", f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    with open(out_path, "w") as f:
+        json.dump({"commit": commit, "date": datetime.datetime.now().isoformat(timespec="seconds"),
+                   "python": platform.python_version(), "platform": platform.platform(),
+                   "cpus": os.cpu_count(), "seed": args.seed, "loader": args.loader, "trace": args.trace,
+                   "results": results}, f, indent=1)
+    print(f"\nresults written to {out_path}")
+    if args.compare and not compare(results, args.trace, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 6 and sys.argv[1] == "--child":
+        _, _, folder, visits, loader, trace = sys.argv
+        results = run_size(folder, int(visits), loader, trace == "1")
+        print(json.dumps(results))
+    else:
+        main()
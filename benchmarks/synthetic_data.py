@@ -0,0 +1,169 @@
+# synthetic_data.py
+"""Seeded generator for Patient_data.csv, Notes.csv and Credentials.csv in the shipped schemas.
+
+Run from the repository root:
+    python benchmarks/synthetic_data.py OUT_DIR [--visits N] [--seed S] [--note-chars C] [--users U]
+
+The same seed and sizes always give byte-identical files. Value frequencies
+follow the shipped data; departments are Zipf-skewed, visit volume grows
+year on year with winter peaks and quiet weekends, and most patients have
+one or two visits with a long tail of frequent attenders. Rows are written
+patient by patient, so memory stays flat up to 10M visits.
+"""
+import argparse
+import csv
+import datetime
+import os
+import random
+import string
+
+PATIENT_FIELDS = ['Patient_ID', 'Visit_ID', 'Visit_time', 'Visit_department', 'Race', 'Gender',
+                  'Ethnicity', 'Age', 'Zip_code', 'Insurance', 'Chief_complaint', 'Note_ID', 'Note_type']
+NOTE_FIELDS = ['', 'Patient_ID', 'Visit_ID', 'Note_ID', 'Note_text']
+CREDENTIAL_FIELDS = ['', 'username', 'password', 'role']
+
+# Most common first; departments get Zipf weights, the rest roughly the shipped frequencies.
+DEPARTMENTS = ['Pediatrics', 'Emergency department', 'Cardiology', 'Radiology', 'Obstetrics and gynaecology',
+               'Head and Neck', 'Psychiatry', 'Surgery', 'Neorology', 'Oncology', 'Orthopaedics', 'Dermatology']
+RACES = (['Pacific Islanders', 'Black', 'White', 'Native Americans', 'Asian', 'Unknown'], [41, 35, 34, 32, 28, 25])
+GENDERS = (['Male', 'Female', 'Non-binary'], [70, 68, 57])
+ETHNICITIES = (['Non-Hispanic', 'Hispanic', 'Other', 'Unknown'], [57, 52, 44, 42])
+INSURANCES = (['Medicare', 'Blueshield', 'Not Available', 'Unknown', 'Medicaid'], [43, 43, 41, 40, 28])
+COMPLAINTS = (['chest pain', 'infection', 'Unknown', 'back pain', 'injury', 'fatigue', 'bleeding'],
+              [34, 30, 28, 27, 26, 25, 25])
+NOTE_TYPES = (['social work note', 'discharge note', 'oncology note', 'progress note', 'admission note'],
+              [50, 42, 36, 34, 33])
+ROLES = (['clinician', 'nurse', 'admin', 'management'], [45, 40, 10, 5])
+FIRST_YEAR, LAST_YEAR = 2000, 2024
+WORDS = ("patient presented with history of acute chronic pain fever cough admitted discharged "
+         "evaluation treatment surgery follow-up imaging revealed normal abnormal mild severe "
+         "left right lesion infection blood pressure heart rate stable improved medication dose "
+         "daily weeks months day D1 CT MRI biopsy tumour resection recovery symptoms family").split()
+
+
+def _day_weights():
+    """Every date in the range, weighted by yearly growth, winter peaks and quiet weekends."""
+    days, weights = [], []
+    day = datetime.date(FIRST_YEAR, 1, 1)
+    end = datetime.date(LAST_YEAR, 12, 31)
+    while day <= end:
+        weight = 1.0 + 0.06 * (day.year - FIRST_YEAR)
+        weight *= 1.3 if day.month in (12, 1, 2) else 1.0
+        weight *= 0.6 if day.weekday() >= 5 else 1.0
+        days.append(day)
+        weights.append(weight)
+        day += datetime.timedelta(days=1)
+    return days, weights
+
+
+def _cumulative(weights):
+    total, out = 0.0, []
+    for w in weights:
+        total += w
+        out.append(total)
+    return out
+
+
+class _Picker:
+    """Weighted choice with precomputed cumulative weights."""
+    def __init__(self, rng, values, weights):
+        self.rng = rng
+        self.values = values
+        self.cum = _cumulative(weights)
+
+    def __call__(self):
+        return self.rng.choices(self.values, cum_weights=self.cum)[0]
+
+
+def _note_text(rng, n_chars):
+    """Sentences of filler words, occasionally quoted or split over lines like the shipped notes."""
+    target = max(20, int(rng.lognormvariate(0, 0.5) * n_chars))
+    parts, length = [], 0
+    while length < target:
+        words = rng.choices(WORDS, k=rng.randint(6, 16))
+        sentence = " ".join(words).capitalize() + "."
+        if rng.random() < 0.05:
+            sentence = f'"{sentence}"'
+        parts.append(sentence)
+        parts.append("\n" if rng.random() < 0.1 else " ")
+        length += len(sentence) + 1
+    return "".join(parts).strip()
+
+
+def _visits_per_patient(rng):
+    """Mostly one or two visits; a geometric tail of frequent attenders."""
+    r = rng.random()
+    if r < 0.45:
+        return 1
+    if r < 0.80:
+        return 2
+    n = 3
+    while rng.random() < 0.7 and n < 200:
+        n += 1
+    return n
+
+
+def generate(folder, n_visits, seed=0, note_chars=600, n_users=50):
+    """Write the three CSVs into folder; return (data_path, notes_path, credentials_path)."""
+    rng = random.Random(seed)
+    os.makedirs(folder, exist_ok=True)
+    data_path = os.path.join(folder, "Patient_data.csv")
+    notes_path = os.path.join(folder, "Notes.csv")
+    credentials_path = os.path.join(folder, "Credentials.csv")
+
+    days, day_weights = _day_weights()
+    pick_day = _Picker(rng, days, day_weights)
+    pick_dept = _Picker(rng, DEPARTMENTS, [1 / (rank + 1) for rank in range(len(DEPARTMENTS))])
+    pick_race, pick_gender, pick_ethnicity, pick_insurance, pick_complaint, pick_note_type = (
+        _Picker(rng, *choices) for choices in (RACES, GENDERS, ETHNICITIES, INSURANCES, COMPLAINTS, NOTE_TYPES))
+    zip_codes = [str(53001 + i) for i in range(150)]
+    pick_zip = _Picker(rng, zip_codes, [1 / (rank + 1) ** 0.8 for rank in range(len(zip_codes))])
+
+    with open(data_path, "w", newline="") as df, open(notes_path, "w", newline="") as nf:
+        data = csv.writer(df)
+        notes = csv.writer(nf)
+        data.writerow(PATIENT_FIELDS)
+        notes.writerow(NOTE_FIELDS)
+        written = 0
+        patient_id = 10000
+        while written < n_visits:
+            patient_id += rng.randint(1, 9)
+            demographics = (pick_race(), pick_gender(), pick_ethnicity())
+            zip_code, insurance = pick_zip(), pick_insurance()
+            n = min(_visits_per_patient(rng), n_visits - written)
+            dates = sorted(pick_day() for _ in range(n))
+            birth_year = dates[0].year - rng.randint(0, 90)
+            for day in dates:
+                visit_id = str(100000 + written)
+                note_id = str(500000 + written)
+                age = min(112, max(0, day.year - birth_year))
+                data.writerow([patient_id, visit_id, f"{day.month}/{day.day}/{day.year}", pick_dept(),
+                               *demographics, age, zip_code, insurance, pick_complaint(), note_id, pick_note_type()])
+                notes.writerow([written, patient_id, visit_id, note_id, _note_text(rng, note_chars)])
+                written += 1
+
+    alphabet = string.ascii_uppercase + string.digits
+    pick_role = _Picker(rng, *ROLES)
+    with open(credentials_path, "w", newline="") as cf:
+        creds = csv.writer(cf)
+        creds.writerow(CREDENTIAL_FIELDS)
+        for i in range(n_users):
+            creds.writerow([i, "".join(rng.choices(alphabet, k=7)), "".join(rng.choices(alphabet, k=7)), pick_role()])
+    return data_path, notes_path, credentials_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write seeded synthetic data in the shipped CSV schemas.")
+    parser.add_argument("folder")
+    parser.add_argument("--visits", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--note-chars", type=int, default=600, help="median note length")
+    parser.add_argument("--users", type=int, default=50)
+    args = parser.parse_args()
+    paths = generate(args.folder, args.visits, args.seed, args.note_chars, args.users)
+    for path in paths:
+        print(f"{path}: {os.path.getsize(path) / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+# audit_log.py
+import atexit
+import csv
+import os
+import queue
+import sys
+import threading
+import time
+
+_STOP = object()
+
+
+class AuditLogger:
+    """Queue usage-log rows and append them to a CSV in batches from a background thread.
+
+    Rows are written once batch_size have queued or flush_interval seconds
+    after the first unwritten row. log() blocks when the queue is full rather
+    than dropping rows, and close() (also run at interpreter exit) writes
+    everything still queued.
+
+    A failed write is retried every flush_interval seconds. Once a batch has
+    failed max_retries times in a row, or has grown to max_queue rows, its
+    rows are printed to stderr and dropped, so a missing or read-only folder
+    can neither hang close() nor grow memory without bound.
+    """
+    def __init__(self, path, headers, batch_size=100, flush_interval=1.0, max_queue=10000, max_retries=3):
+        self.path = path
+        self.headers = headers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.closed = False
+        self.lock = threading.Lock()
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        except OSError:
+            pass  # _write reports the failure
+        self.thread = threading.Thread(target=self._run, name="audit-log", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def log(self, row):
+        with self.lock:
+            if not self.closed:
+                self.queue.put(row)
+                return
+        self._write([row])
+
+    def flush(self):
+        """Block until every row logged so far is on disk."""
+        done = threading.Event()
+        with self.lock:
+            if self.closed:
+                return  # close() writes (or reports) everything still queued
+            self.queue.put(done)
+        done.wait()
+
+    def close(self):
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.queue.put(_STOP)
+        self.thread.join()
+
+    def _run(self):
+        batch = []
+        failures = 0
+        deadline = None
+        while True:
+            timeout = None if not batch else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP or isinstance(item, threading.Event):
+                while batch and not self._write(batch):
+                    failures += 1
+                    if failures > self.max_retries:
+                        self._report(batch)
+                        break
+                    time.sleep(self.flush_interval)
+                batch = []
+                failures = 0
+                if item is _STOP:
+                    return
+                item.set()
+                continue
+            if item is not None:
+                batch.append(item)
+                if len(batch) == 1:
+                    deadline = time.monotonic() + self.flush_interval
+            full = len(batch) >= (self.max_queue if failures else self.batch_size)
+            if batch and (full or time.monotonic() >= deadline):
+                if self._write(batch):
+                    batch = []
+                    failures = 0
+                    continue
+                failures += 1
+                if failures > self.max_retries or len(batch) >= self.max_queue:
+                    self._report(batch)
+                    batch = []
+                    failures = 0
+                else:
+                    deadline = time.monotonic() + self.flush_interval
+
+    def _report(self, rows):
+        """Print rows that could not be written to stderr so they are not lost silently."""
+        print(f"Error: gave up writing {len(rows)} usage log rows to {self.path}:", file=sys.stderr)
+        csv.writer(sys.stderr).writerows(rows)
+
+    def _write(self, rows):
+        """Append rows, writing the header first for a new file; return success."""
+        try:
+            write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            with open(self.path, "a", newline="") as f:
+                writer = csv.writer(f)
+                if write_header:
+                    writer.writerow(self.headers)
+                writer.writerows(rows)
+            return True
+        except OSError as e:
+            print(f"Warning: could not write usage log ({e}).", file=sys.stderr)
+            return False
@@ -0,0 +1,213 @@
+# cli.py
+"""Headless command-line access to the patient data.
+
+    python cli.py --user NAME count-visits 2011-07-13
+    python cli.py --user NAME batch commands.txt
+
+The password is read from $PMS_PASSWORD or prompted for. A batch file holds
+one command per line (same syntax as the command line, '#' starts a comment)
+and all of its commands share one data load.
+"""
+import argparse
+import datetime
+import getpass
+import os
+import shlex
+import sys
+from audit_log import AuditLogger
+from cohort import parse_filters
+from metrics import METRICS
+from patient_management import PatientManagementSystem
+from user import User
+from utils import authenticate
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Patient management without the GUI.")
+    parser.add_argument("--user", required=True, help="username from the credentials file")
+    parser.add_argument("--data", default="data/Patient_data.csv")
+    parser.add_argument("--notes", default="data/Notes.csv")
+    parser.add_argument("--credentials", default=os.environ.get("PMS_CREDENTIALS", "data/Credentials.csv"))
+    parser.add_argument("--backend", choices=("csv", "sqlite"), default="csv")
+    parser.add_argument("--loader", choices=("rows", "columnar", "parallel"), default="rows")
+    parser.add_argument("--workers", type=int, help="processes for --loader parallel (default: CPU count)")
+    add_commands(parser.add_subparsers(dest="command", required=True))
+    return parser
+
+
+def add_commands(sub):
+    p = sub.add_parser("count-visits", help="count visits on a date")
+    p.add_argument("date")
+    p = sub.add_parser("view-note", help="show a patient's notes on a date")
+    p.add_argument("patient_id")
+    p.add_argument("date")
+    p = sub.add_parser("retrieve", help="write a patient's record to a file and print it")
+    p.add_argument("patient_id")
+    p.add_argument("--output", default="output/output.txt")
+    p = sub.add_parser("export", help="stream many patients to one text/CSV/JSONL file (.gz to compress)")
+    p.add_argument("output")
+    source = p.add_mutually_exclusive_group(required=True)
+    source.add_argument("--ids", help="file of patient IDs, one per line ('-' for stdin)")
+    source.add_argument("--cohort", help="export patients with a visit matching these cohort filters")
+    p.add_argument("--format", choices=("text", "csv", "jsonl"), help="default: from the file name")
+    p = sub.add_parser("add", help="add a visit")
+    for name in ("patient_id", "date", "department", "gender", "race", "age",
+                 "ethnicity", "insurance", "zip_code", "complaint"):
+        p.add_argument(name, type=int if name == "age" else str)
+    p = sub.add_parser("remove", help="remove a patient")
+    p.add_argument("patient_id")
+    sub.add_parser("stats", help="save the statistics chart to output/visit_stats.png")
+    p = sub.add_parser("cohort", help="count visits matching 'field=value; from=...; to=...'")
+    p.add_argument("filters")
+    p = sub.add_parser("search", help="full-text search of clinical notes")
+    p.add_argument("query", nargs="+")
+    p = sub.add_parser("batch", help="run commands from a file ('-' for stdin)")
+    p.add_argument("file")
+
+
+# command -> (permission checked with User.can_perform, usage log action name)
+COMMANDS = {
+    "count-visits": ("count_visits", "Count Visits"),
+    "view-note": ("view_note", "View Note"),
+    "retrieve": ("retrieve_patient", "Retrieve Patient"),
+    "export": ("retrieve_patient", "Export Patients"),
+    "add": ("add_patient", "Add Patient"),
+    "remove": ("remove_patient", "Remove Patient"),
+    "stats": ("generate_statistics", "Generate Statistics"),
+    "cohort": ("cohort_count", "Cohort Count"),
+    "search": ("search_notes", "Search Notes"),
+}
+
+
+class Session:
+    """Runs commands for one authenticated user against a lazily loaded system."""
+    def __init__(self, options, user, audit_log):
+        self.options = options
+        self.user = user
+        self.audit_log = audit_log
+        self.login_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.system = None
+        self.notes_loaded = False
+
+    def get_system(self, notes=False):
+        if self.system is None:
+            self.system = PatientManagementSystem(
+                self.options.data, loader=self.options.loader, backend=self.options.backend,
+                workers=self.options.workers)
+        if notes and not self.notes_loaded:
+            self.system.load_notes(self.options.notes)
+            self.notes_loaded = True
+        return self.system
+
+    def run(self, args):
+        """Run one parsed command and return its output text."""
+        with METRICS.timer(f"command.{args.command}"):
+            return self._run(args)
+
+    def _run(self, args):
+        permission, action = COMMANDS[args.command]
+        if not self.user.can_perform(permission):
+            raise PermissionError(f"role '{self.user.role}' may not run {args.command}")
+        self.audit_log.log([self.user.username, self.user.role, action, self.login_time,
+                            datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")])
+        if args.command == "count-visits":
+            count = self.get_system().review_date(args.date)
+            if count is None:
+                raise ValueError(f"invalid date {args.date!r}")
+            return f"Total visits on {args.date}: {count}"
+        if args.command == "view-note":
+            note = self.get_system(notes=True).view_note(args.patient_id, args.date)
+            return note or f"No notes on {args.date} for {args.patient_id}."
+        if args.command == "retrieve":
+            if not self.get_system(notes=True).retrieve_patient(args.patient_id, args.output):
+                return f"Patient {args.patient_id} not found."
+            with open(args.output) as f:
+                return f.read().rstrip("\n")
+        if args.command == "export":
+            system = self.get_system(notes=True)
+            if args.cohort is not None:
+                filters, date_from, date_to = parse_filters(args.cohort)
+                count = system.export_patients(args.output, filters=filters, date_from=date_from,
+                                               date_to=date_to, fmt=args.format)
+            elif args.ids == "-":
+                count = system.export_patients(args.output, patient_ids=sys.stdin, fmt=args.format)
+            else:
+                with open(args.ids) as ids:
+                    count = system.export_patients(args.output, patient_ids=ids, fmt=args.format)
+            return f"Exported {count} patients to {args.output}."
+        if args.command == "add":
+            datetime.datetime.strptime(args.date, "%Y-%m-%d")
+            self.get_system().add_visit_gui(
+                args.patient_id, args.date, args.department, args.gender, args.race, args.age,
+                args.ethnicity, args.insurance, args.zip_code, args.complaint)
+            return f"Added visit for {args.patient_id} on {args.date}."
+        if args.command == "remove":
+            self.get_system().remove_patient(args.patient_id)
+            return f"Removed patient {args.patient_id}."
+        if args.command == "stats":
+            self.get_system().generate_statistics()
+            return "Statistics chart saved to visit_stats.png"
+        if args.command == "cohort":
+            filters, date_from, date_to = parse_filters(args.filters)
+            return f"Visits matching {args.filters}: {self.get_system().cohort_count(filters, date_from, date_to)}"
+        if args.command == "search":
+            hits = self.get_system(notes=True).search_notes(" ".join(args.query))
+            return "\n".join(f"{score:.2f}\t{pid}\t{visit_id}\t{note_id}" for score, pid, visit_id, note_id in hits)
+        raise ValueError(f"unknown command {args.command!r}")
+
+    def run_batch(self, lines, parser):
+        """Run each command line; returns the number of failed commands."""
+        failures = 0
+        for number, line in enumerate(lines, 1):
+            words = shlex.split(line, comments=True)
+            if not words:
+                continue
+            try:
+                args = parser.parse_args(words)
+                if args.command == "batch":
+                    raise ValueError("batch files cannot run other batch files")
+                print(self.run(args))
+            except SystemExit:
+                failures += 1  # argparse already printed the usage error
+            except (ValueError, PermissionError, OSError) as e:
+                failures += 1
+                print(f"line {number}: error: {e}", file=sys.stderr)
+        return failures
+
+
+def main(argv=None):
+    parser = build_parser()
+    options = parser.parse_args(argv)
+    password = os.environ.get("PMS_PASSWORD") or getpass.getpass(f"Password for {options.user}: ")
+    role = authenticate(options.user, password, options.credentials)
+    if role is None:
+        print("Invalid username or password", file=sys.stderr)
+        return 2
+    audit_log = AuditLogger("output/usage_log.csv", ["Username", "Role", "Action", "Login Time", "Action Time"])
+    session = Session(options, User(options.user, role), audit_log)
+    try:
+        if options.command == "batch":
+            batch_parser = argparse.ArgumentParser(prog="batch", add_help=False)
+            add_commands(batch_parser.add_subparsers(dest="command", required=True))
+            if options.file == "-":
+                failures = session.run_batch(sys.stdin, batch_parser)
+            else:
+                with open(options.file) as f:
+                    failures = session.run_batch(f, batch_parser)
+            status = 1 if failures else 0
+        else:
+            try:
+                print(session.run(options))
+                status = 0
+            except (ValueError, PermissionError, OSError) as e:
+                print(f"error: {e}", file=sys.stderr)
+                status = 1
+        if session.system is not None:
+            session.system.compact()
+        return status
+    finally:
+        audit_log.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
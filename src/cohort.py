@@ -0,0 +1,108 @@
+# cohort.py
+from array import array
+from bisect import bisect_left, bisect_right
+from visit_stats import age_group
+
+FIELDS = ("gender", "race", "ethnicity", "insurance", "department", "chief_complaint", "age_group", "zip_code")
+
+
+def _field_value(visit, field):
+    if field == "department":
+        return visit.department.name
+    if field == "age_group":
+        return age_group(visit.age)
+    return getattr(visit, field)
+
+
+def parse_filters(text):
+    """Parse 'insurance=Medicare; age_group=Senior|Adult; from=2015-01-01; to=2018-12-31'.
+
+    Returns (filters, date_from, date_to); '|' separates alternatives for a field.
+    """
+    filters, date_from, date_to = {}, None, None
+    for part in text.split(';'):
+        if not part.strip():
+            continue
+        key, sep, value = part.partition('=')
+        key = key.strip().lower().replace(' ', '_')
+        if not sep or not value.strip():
+            raise ValueError(f"Expected field=value, got {part.strip()!r}")
+        if key == "from":
+            date_from = value.strip()
+        elif key == "to":
+            date_to = value.strip()
+        elif key in FIELDS:
+            filters[key] = [v.strip() for v in value.split('|')]
+        else:
+            raise ValueError(f"Unknown field {key!r}; use one of {', '.join(FIELDS)}, from, to")
+    return filters, date_from, date_to
+
+
+class CohortIndex:
+    """Bitmap index over visit demographics for ad-hoc cohort counts.
+
+    Visits are numbered in date order, so a date range is a contiguous run of
+    bits found by binary search. Each categorical value keeps the sorted row
+    numbers it occurs in; its bitmap (a Python int) is built on first use.
+    Matching is case-insensitive.
+    """
+    def __init__(self, visits):
+        """visits: iterable of (patient_id, visit)."""
+        rows = sorted(visits, key=lambda item: item[1].visit_date)
+        self.rows = rows
+        self.dates = [visit.visit_date for _, visit in rows]
+        self.values = {field: {} for field in FIELDS}
+        for row, (_, visit) in enumerate(rows):
+            for field in FIELDS:
+                key = str(_field_value(visit, field)).lower()
+                positions = self.values[field].get(key)
+                if positions is None:
+                    positions = self.values[field][key] = array('I')
+                positions.append(row)
+        self._bitmaps = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def bitmap(self, field, value):
+        key = (field, value.lower())
+        bits = self._bitmaps.get(key)
+        if bits is None:
+            buf = bytearray((len(self.rows) + 7) // 8)
+            for row in self.values[field].get(key[1], ()):
+                buf[row >> 3] |= 1 << (row & 7)
+            bits = self._bitmaps[key] = int.from_bytes(buf, 'little')
+        return bits
+
+    def match(self, filters, date_from=None, date_to=None):
+        """Return the bitmap of rows matching every field (any listed value) between two dates."""
+        lo = bisect_left(self.dates, date_from) if date_from else 0
+        hi = bisect_right(self.dates, date_to) if date_to else len(self.dates)
+        if hi <= lo:
+            return 0
+        mask = ((1 << hi) - 1) ^ ((1 << lo) - 1)
+        for field, values in filters.items():
+            if field not in self.values:
+                raise ValueError(f"Unknown cohort field {field!r}")
+            if isinstance(values, str):
+                values = [values]
+            either = 0
+            for value in values:
+                either |= self.bitmap(field, value)
+            mask &= either
+            if not mask:
+                break
+        return mask
+
+    def count(self, filters, date_from=None, date_to=None):
+        return self.match(filters, date_from, date_to).bit_count()
+
+    def select(self, filters, date_from=None, date_to=None):
+        """Yield (patient_id, visit) for matching rows in date order."""
+        mask = self.match(filters, date_from, date_to)
+        data = mask.to_bytes((mask.bit_length() + 7) // 8, 'little')
+        for i, byte in enumerate(data):
+            while byte:
+                low = byte & -byte
+                yield self.rows[(i << 3) + low.bit_length() - 1]
+                byte ^= low
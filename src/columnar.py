@@ -0,0 +1,237 @@
+# columnar.py
+import csv
+import datetime
+from array import array
+from itertools import islice
+from dates import DATE_FORMATS
+
+
+def _fast_iso(s):
+    # fromisoformat also takes forms strptime rejects, such as 20110714 and 2011-W28-5.
+    if len(s) != 10 or s[4] != '-' or s[7] != '-':
+        raise ValueError(s)
+    return datetime.date.fromisoformat(s)
+
+
+def _split_mdy(sep):
+    def parse(s):
+        m, d, y = s.split(sep)
+        if not (m.isdigit() and d.isdigit() and y.isdigit()) or len(m) > 2 or len(d) > 2 or len(y) != 4:
+            raise ValueError(s)
+        return datetime.date(int(y), int(m), int(d))
+    return parse
+
+
+# Fast equivalents of strptime for each format in DATE_FORMATS.
+FAST_PARSERS = {
+    "%Y-%m-%d": _fast_iso,
+    "%m/%d/%Y": _split_mdy("/"),
+    "%m-%d-%Y": _split_mdy("-"),
+}
+
+
+def detect_format(values):
+    """Return the first format in DATE_FORMATS that parses a sample value."""
+    for s in values:
+        if not s:
+            continue
+        for fmt in DATE_FORMATS:
+            try:
+                datetime.datetime.strptime(s, fmt)
+                return fmt
+            except ValueError:
+                continue
+        return None
+    return None
+
+
+def parse_date_column(values, fallback, parsed=None):
+    """Parse a column of date strings, returning a list of dates or None.
+
+    The format is detected once for the batch and every distinct string is
+    parsed only once; strings that don't match go through fallback, which
+    must raise ValueError for unparseable input. Pass the same parsed dict
+    for every batch of a file to reuse results across batches.
+    """
+    if parsed is None:
+        parsed = {}
+    fmt = detect_format(values)
+    fast = FAST_PARSERS.get(fmt)
+    for s in set(values).difference(parsed):
+        try:
+            if fast is None:
+                raise ValueError(s)
+            parsed[s] = fast(s)
+        except ValueError:
+            try:
+                parsed[s] = fallback(s)
+            except ValueError:
+                parsed[s] = None
+    return [parsed[s] for s in values]
+
+
+def iter_column_chunks(path, chunk_size=65536):
+    """Yield {column: tuple of stripped strings} for chunk_size rows at a time."""
+    with open(path, 'r', newline='') as file:
+        reader = csv.reader(file)
+        header = [h.strip() for h in next(reader, [])]
+        width = len(header)
+        while True:
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                break
+            # Blank lines are skipped, as csv.DictReader does.
+            rows = [r if len(r) == width else (r + [''] * width)[:width] for r in rows if r]
+            if not rows:
+                continue
+            chunk = {name: tuple(map(str.strip, col)) for name, col in zip(header, zip(*rows))}
+            del rows  # so only one chunk's strings are alive at a time
+            yield chunk
+            del chunk
+
+
+class CodedColumn:
+    """A column of repeated values stored as small integer codes into a table of distinct values."""
+    def __init__(self):
+        self.values = []
+        self.index = {}
+        self.codes = array('B')
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, row):
+        return self.values[self.codes[row]]
+
+    def _add_values(self, values):
+        index = self.index
+        for value in dict.fromkeys(values):
+            if value not in index:
+                index[value] = len(self.values)
+                self.values.append(value)
+        # Widen the codes once there are more distinct values than the type can hold.
+        if len(self.values) > 65536 and self.codes.typecode != 'l':
+            self.codes = array('l', self.codes)
+        elif len(self.values) > 256 and self.codes.typecode == 'B':
+            self.codes = array('H', self.codes)
+
+    def extend(self, values):
+        self._add_values(values)
+        self.codes.extend(map(self.index.__getitem__, values))
+
+    def append(self, value):
+        self.extend((value,))
+
+
+class VisitColumns:
+    """Column storage for visits; row i of every column belongs to one visit."""
+    def __init__(self):
+        self.visit_id = []
+        self.visit_date = array('l')
+        self.department = CodedColumn()
+        self.gender = CodedColumn()
+        self.race = CodedColumn()
+        self.age = array('l')
+        self.ethnicity = CodedColumn()
+        self.insurance = CodedColumn()
+        self.zip_code = CodedColumn()
+        self.chief_complaint = CodedColumn()
+
+    def __len__(self):
+        return len(self.visit_id)
+
+    def extend(self, visit_id, visit_date, department, gender, race, age, ethnicity, insurance, zip_code, chief_complaint):
+        """Append a batch of visits given as equal-length sequences; return the first new row."""
+        first = len(self.visit_id)
+        self.visit_id.extend(visit_id)
+        self.visit_date.extend(d.toordinal() for d in visit_date)
+        self.department.extend(department)
+        self.gender.extend(gender)
+        self.race.extend(race)
+        self.age.extend(age)
+        self.ethnicity.extend(ethnicity)
+        self.insurance.extend(insurance)
+        self.zip_code.extend(zip_code)
+        self.chief_complaint.extend(chief_complaint)
+        return first
+
+    def append_visit(self, visit):
+        """Append one Visit as a new row and return its row number."""
+        return self.extend(
+            (visit.visit_id,), (visit.visit_date,), (visit.department,), (visit.gender,), (visit.race,),
+            (visit.age,), (visit.ethnicity,), (visit.insurance,), (visit.zip_code,), (visit.chief_complaint,)
+        )
+
+
+class VisitView:
+    """A read-only Visit backed by one row of a VisitColumns."""
+    __slots__ = ("_columns", "_row")
+
+    def __init__(self, columns, row):
+        self._columns = columns
+        self._row = row
+
+    @property
+    def visit_id(self):
+        return self._columns.visit_id[self._row]
+
+    @property
+    def visit_date(self):
+        return datetime.date.fromordinal(self._columns.visit_date[self._row])
+
+    @property
+    def visit_time(self):
+        return self.visit_date.isoformat()
+
+    @property
+    def department(self):
+        return self._columns.department[self._row]
+
+    @property
+    def gender(self):
+        return self._columns.gender[self._row]
+
+    @property
+    def race(self):
+        return self._columns.race[self._row]
+
+    @property
+    def age(self):
+        return self._columns.age[self._row]
+
+    @property
+    def ethnicity(self):
+        return self._columns.ethnicity[self._row]
+
+    @property
+    def insurance(self):
+        return self._columns.insurance[self._row]
+
+    @property
+    def zip_code(self):
+        return self._columns.zip_code[self._row]
+
+    @property
+    def chief_complaint(self):
+        return self._columns.chief_complaint[self._row]
+
+
+class ColumnarPatient:
+    """A patient whose visits are row numbers in a VisitColumns, read back as VisitViews."""
+    __slots__ = ("patient_id", "rows", "notes", "_columns")
+
+    def __init__(self, patient_id, columns):
+        self.patient_id = patient_id
+        self.rows = array('l')
+        self.notes = []
+        self._columns = columns
+
+    @property
+    def visits(self):
+        return [VisitView(self._columns, row) for row in self.rows]
+
+    def add_visit(self, visit):
+        self.rows.append(self._columns.append_visit(visit))
+
+    def add_note(self, note):
+        self.notes.append(note)
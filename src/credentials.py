@@ -0,0 +1,126 @@
+# credentials.py
+import csv
+import hashlib
+import hmac
+import os
+import sys
+
+# scrypt cost parameters; raise SCRYPT_N to make each login (and each guess) slower.
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+
+def hash_password(password, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, salt=None):
+    """Return a salted scrypt hash encoded as 'scrypt$n$r$p$salt$hash'."""
+    salt = salt or os.urandom(16)
+    digest = hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+                            maxmem=2 * 128 * n * r + 2 ** 20)
+    return f"scrypt${n}${r}${p}${salt.hex()}${digest.hex()}"
+
+
+def _parse_hash(encoded):
+    """Split 'scrypt$n$r$p$salt$hash' into (n, r, p, salt bytes, hash hex); raises ValueError."""
+    algo, n, r, p, salt, digest = encoded.split('$')
+    if algo != "scrypt":
+        raise ValueError(f"unknown algorithm {algo!r}")
+    bytes.fromhex(digest)
+    return int(n), int(r), int(p), bytes.fromhex(salt), digest
+
+
+def verify_password(password, encoded):
+    """Check a password against a hash made by hash_password; False for a malformed hash."""
+    try:
+        n, r, p, salt, digest = _parse_hash(encoded)
+        candidate = hash_password(password, n, r, p, salt)
+        return hmac.compare_digest(candidate.rsplit('$', 1)[1], digest)
+    except (ValueError, TypeError, AttributeError, MemoryError):
+        return False
+
+
+class CredentialStore:
+    """Username index over a credentials CSV.
+
+    Reads either the hashed format written by migrate() (column password_hash)
+    or the legacy plaintext format (column password), which is compared in
+    constant time until the file is migrated.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.users = {}  # username -> (password_hash or None, plaintext or None, role)
+        self.hashed = False
+        self.mtime = None
+        self.dummy_hash = None
+        self.load()
+
+    def load(self):
+        self.users = {}
+        self.mtime = os.stat(self.path).st_mtime_ns
+        with open(self.path, newline='') as f:
+            reader = csv.DictReader(f)
+            self.hashed = 'password_hash' in (reader.fieldnames or [])
+            for row in reader:
+                if self.hashed:
+                    self.users[row['username']] = (row['password_hash'], None, row['role'])
+                else:
+                    self.users[row['username']] = (None, row['password'], row['role'])
+        if self.hashed and self.users:
+            # Unknown usernames are checked against this so they cost as much as real ones.
+            # Use the cost of the first well-formed hash, falling back to the defaults.
+            n, r, p = SCRYPT_N, SCRYPT_R, SCRYPT_P
+            for password_hash, _, _ in self.users.values():
+                try:
+                    n, r, p = _parse_hash(password_hash)[:3]
+                    break
+                except (ValueError, AttributeError):
+                    continue
+            try:
+                self.dummy_hash = hash_password("", n, r, p)
+            except (ValueError, MemoryError):
+                self.dummy_hash = hash_password("")
+        elif self.users:
+            print(f"Warning: {self.path} stores plaintext passwords; run credentials.py to migrate it.",
+                  file=sys.stderr)
+
+    def reload_if_changed(self):
+        if os.stat(self.path).st_mtime_ns != self.mtime:
+            self.load()
+
+    def authenticate(self, username, password):
+        """Return the user's role if the password matches, else None."""
+        entry = self.users.get(username)
+        if entry is None:
+            if self.dummy_hash is not None:
+                verify_password(password, self.dummy_hash)
+            return None
+        password_hash, plaintext, role = entry
+        if password_hash is not None:
+            ok = verify_password(password, password_hash)
+        else:
+            ok = hmac.compare_digest(plaintext.encode('utf-8'), password.encode('utf-8'))
+        return role if ok else None
+
+
+def migrate(src_path, dst_path, n=SCRYPT_N):
+    """Write a copy of a plaintext credentials CSV with salted password hashes."""
+    with open(src_path, newline='') as src:
+        reader = csv.DictReader(src)
+        if 'password' not in (reader.fieldnames or []):
+            raise ValueError(f"{src_path} has no plaintext password column")
+        fieldnames = ['password_hash' if name == 'password' else name for name in reader.fieldnames]
+        rows = list(reader)
+    tmp_path = dst_path + ".tmp"
+    with open(tmp_path, 'w', newline='') as dst:
+        writer = csv.DictWriter(dst, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            row['password_hash'] = hash_password(row.pop('password'), n=n)
+            writer.writerow(row)
+    os.replace(tmp_path, dst_path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4):
+        print("Usage: python credentials.py <plaintext.csv> <hashed.csv> [scrypt_n]")
+        sys.exit(1)
+    migrate(sys.argv[1], sys.argv[2], int(sys.argv[3]) if len(sys.argv) == 4 else SCRYPT_N)
@@ -0,0 +1,57 @@
+# dataset_cache.py
+import os
+import threading
+import time
+from patient_management import PatientManagementSystem
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class DatasetCache:
+    """Process-wide cache of loaded PatientManagementSystem models.
+
+    An entry is reused while the data and notes files keep the same mtime and
+    size and no other process has written the data file's journal. Changes
+    made through the cached system itself go to its journal too, but they are
+    already reflected in memory, so they don't invalidate the entry.
+    """
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.last_load_seconds = None
+
+    def get(self, data_path, notes_path, **options):
+        """Return a loaded system for the files, loading it only if needed."""
+        key = (os.path.abspath(data_path), os.path.abspath(notes_path), tuple(sorted(options.items())))
+        signature = (_signature(data_path), _signature(notes_path))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature and not entry[1].journal.changed_elsewhere():
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            start = time.perf_counter()
+            system = PatientManagementSystem(data_path, **options)
+            system.load_notes(notes_path)
+            self.last_load_seconds = time.perf_counter() - start
+            self._entries[key] = (signature, system)
+            return system
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    def summary(self):
+        load = "n/a" if self.last_load_seconds is None else f"{self.last_load_seconds:.2f} s"
+        return f"Data load: {load} | cache hits: {self.hits}, misses: {self.misses}"
+
+
+shared_cache = DatasetCache()
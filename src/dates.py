@@ -0,0 +1,31 @@
+# dates.py
+import datetime
+from functools import lru_cache
+from metrics import METRICS
+
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y")
+
+
+@lru_cache(maxsize=1 << 16)
+def parse_date(s):
+    """Parse a date string in any of DATE_FORMATS.
+
+    Memoized because the same dates repeat across many visits; repeated
+    strings also share one date object.
+    """
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(s.strip(), fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Unknown date format: {s!r}")
+
+
+def _cache_hit_rate():
+    info = parse_date.cache_info()
+    return round(info.hits / max(1, info.hits + info.misses), 4)
+
+
+METRICS.gauge("parse_date.cache_hits", lambda: parse_date.cache_info().hits)
+METRICS.gauge("parse_date.cache_misses", lambda: parse_date.cache_info().misses)
+METRICS.gauge("parse_date.cache_hit_rate", _cache_hit_rate)
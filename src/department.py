@@ -1,6 +1,8 @@
 # department.py
 class Department:
     """A department contains a set of patients."""
+    __slots__ = ("name", "patients")
+
     def __init__(self, name):
         self.name = name
         self.patients = set()
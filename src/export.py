@@ -0,0 +1,130 @@
+# export.py
+import csv
+import gzip
+import io
+import json
+import os
+
+FORMATS = ("text", "csv", "jsonl")
+CSV_FIELDS = ["Patient_ID", "Visit_ID", "Visit_time", "Visit_department", "Gender", "Race", "Age",
+              "Ethnicity", "Insurance", "Zip_code", "Chief_complaint", "Note_ID", "Note_text"]
+
+
+def patient_record(patient):
+    """Return a patient as a dict with each note nested under its visit.
+
+    Notes whose visit_id matches none of the patient's visits are listed
+    under 'unlinked_notes'.
+    """
+    by_visit = {}
+    for note in patient.notes:
+        by_visit.setdefault(note.visit_id, []).append({"note_id": note.note_id, "note_text": note.note_text})
+    visits = []
+    for visit in patient.visits:
+        visits.append({
+            "visit_id": visit.visit_id, "visit_time": visit.visit_time,
+            "department": visit.department.name, "gender": visit.gender, "race": visit.race,
+            "age": visit.age, "ethnicity": visit.ethnicity, "insurance": visit.insurance,
+            "zip_code": visit.zip_code, "chief_complaint": visit.chief_complaint,
+            "notes": by_visit.pop(visit.visit_id, []),
+        })
+    unlinked = [note for notes in by_visit.values() for note in notes]
+    return {"patient_id": patient.patient_id, "visits": visits, "unlinked_notes": unlinked}
+
+
+def iter_records(system, patient_ids):
+    """Yield a patient_record for each known ID, skipping unknown and repeated IDs."""
+    seen = set()  # only IDs are kept; each patient's record is dropped once written
+    for patient_id in patient_ids:
+        patient_id = patient_id.strip()
+        if not patient_id or patient_id in seen:
+            continue
+        seen.add(patient_id)
+        patient = system.get_patient(patient_id)
+        if patient is not None:
+            yield patient_record(patient)
+
+
+def cohort_patient_ids(system, filters, date_from=None, date_to=None):
+    """Yield the IDs of patients with a visit in the cohort, in order of their first match."""
+    for patient_id, _ in system.cohort(filters, date_from, date_to):
+        yield patient_id
+
+
+def write_text(f, record):
+    f.write(f"Patient ID: {record['patient_id']}\n")
+    for visit in record["visits"]:
+        f.write(f"Visit ID: {visit['visit_id']}, Date: {visit['visit_time']}, "
+                f"Dept: {visit['department']}, Chief Complaint: {visit['chief_complaint']}\n")
+        for note in visit["notes"]:
+            f.write(f"  Note ID: {note['note_id']}, Text: {note['note_text']}\n")
+    for note in record["unlinked_notes"]:
+        f.write(f"Note ID: {note['note_id']}, Text: {note['note_text']}\n")
+
+
+def _csv_rows(record):
+    """One row per note, or per visit for visits without notes."""
+    pid = record["patient_id"]
+    for visit in record["visits"]:
+        fields = [pid, visit["visit_id"], visit["visit_time"], visit["department"], visit["gender"],
+                  visit["race"], visit["age"], visit["ethnicity"], visit["insurance"],
+                  visit["zip_code"], visit["chief_complaint"]]
+        if not visit["notes"]:
+            yield fields + ["", ""]
+        for note in visit["notes"]:
+            yield fields + [note["note_id"], note["note_text"]]
+    for note in record["unlinked_notes"]:
+        yield [pid] + [""] * 10 + [note["note_id"], note["note_text"]]
+
+
+def format_for(path):
+    """Guess the export format from a file name such as cohort.jsonl.gz."""
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".json")):
+        return "jsonl"
+    return "text"
+
+
+def open_output(path, compress, buffer_size=1 << 20):
+    """Open a text stream for writing with a large buffer, gzipped if compress."""
+    if compress:
+        raw = gzip.GzipFile(path, "wb", compresslevel=6)
+        return io.TextIOWrapper(io.BufferedWriter(raw, buffer_size), encoding="utf-8", newline="")
+    return open(path, "w", buffering=buffer_size, encoding="utf-8", newline="")
+
+
+def write_records(records, path, fmt=None, compress=None, buffer_size=1 << 20):
+    """Stream records to path in one pass and return how many were written.
+
+    Records are written as they are produced, so memory doesn't grow with the
+    export. The file is written under a temporary name and renamed when complete.
+    """
+    fmt = fmt or format_for(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; use one of {', '.join(FORMATS)}")
+    if compress is None:
+        compress = path.endswith(".gz")
+    tmp_path = path + ".tmp"
+    count = 0
+    try:
+        with open_output(tmp_path, compress, buffer_size) as f:
+            if fmt == "csv":
+                writer = csv.writer(f)
+                writer.writerow(CSV_FIELDS)
+            for record in records:
+                if fmt == "csv":
+                    writer.writerows(_csv_rows(record))
+                elif fmt == "jsonl":
+                    f.write(json.dumps(record, ensure_ascii=False))
+                    f.write("\n")
+                else:
+                    write_text(f, record)
+                count += 1
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
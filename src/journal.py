@@ -0,0 +1,120 @@
+# journal.py
+import csv
+import os
+
+VISIT_FIELDS = [
+    'Patient_ID', 'Visit_ID', 'Visit_time', 'Visit_department',
+    'Gender', 'Race', 'Age', 'Ethnicity',
+    'Insurance', 'Zip_code', 'Chief_complaint'
+]
+
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _key(row):
+    return row['Patient_ID'].strip(), row['Visit_ID'].strip()
+
+
+class Journal:
+    """Append-only log of adds and removes made since the data CSV was last compacted.
+
+    Each line is either ``add,<VISIT_FIELDS...>`` or ``remove,<Patient_ID>``.
+    Replaying it over the CSV is idempotent, so a crash between writing the
+    compacted CSV and clearing the journal loses nothing.
+    """
+    def __init__(self, data_path):
+        self.data_path = data_path
+        self.path = data_path + ".journal"
+        # (mtime, size) of the journal as of our last replay, append or
+        # compaction; a different value on disk means another process wrote it.
+        self.signature = None
+
+    def changed_elsewhere(self):
+        """True if another process has written the journal since we last did."""
+        return _signature(self.path) != self.signature
+
+    def _append(self, record):
+        before = _signature(self.path)
+        with open(self.path, 'a', newline='') as f:
+            csv.writer(f).writerow(record)
+            f.flush()
+            os.fsync(f.fileno())
+        if before == self.signature:
+            self.signature = _signature(self.path)
+
+    def append_add(self, row):
+        """Record a new visit row given as a dict keyed by VISIT_FIELDS."""
+        self._append(["add"] + [row[name] for name in VISIT_FIELDS])
+
+    def append_remove(self, patient_id):
+        self._append(["remove", patient_id])
+
+    def _truncate_torn_tail(self):
+        """Drop a partial last line left by a crash mid-append."""
+        with open(self.path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            f.seek(max(0, size - 65536))
+            tail = f.read()
+            cut = tail.rfind(b"\n")
+            f.truncate(size - len(tail) + cut + 1 if cut >= 0 else size - len(tail))
+        print("Warning: discarded incomplete last journal entry.")
+
+    def replay(self):
+        """Yield ("add", row dict) and ("remove", patient_id) in journal order."""
+        try:
+            self._truncate_torn_tail()
+            with open(self.path, 'r', newline='') as f:
+                for record in csv.reader(f):
+                    if record and record[0] == "add" and len(record) == len(VISIT_FIELDS) + 1:
+                        yield "add", dict(zip(VISIT_FIELDS, record[1:]))
+                    elif record and record[0] == "remove" and len(record) == 2:
+                        yield "remove", record[1]
+                    else:
+                        print(f"Warning: skipping malformed journal entry: {record}")
+        except FileNotFoundError:
+            pass
+        self.signature = _signature(self.path)
+
+    def compact(self):
+        """Fold the journal into the data CSV atomically, then clear the journal."""
+        ops = list(self.replay())
+        if not ops:
+            return
+        removed = {}  # patient_id -> index of its last remove
+        for i, (op, payload) in enumerate(ops):
+            if op == "remove":
+                removed[payload] = i
+        tmp_path = self.data_path + ".tmp"
+        with open(self.data_path, 'r', newline='') as src, open(tmp_path, 'w', newline='') as dst:
+            reader = csv.DictReader(src)
+            fieldnames = reader.fieldnames or VISIT_FIELDS
+            writer = csv.DictWriter(dst, fieldnames=fieldnames, restval='', extrasaction='ignore')
+            writer.writeheader()
+            added = {_key(row) for op, row in ops if op == "add"}
+            already_written = set()
+            for row in reader:
+                if row['Patient_ID'].strip() not in removed:
+                    writer.writerow(row)
+                    if _key(row) in added:
+                        already_written.add(_key(row))
+            for i, (op, row) in enumerate(ops):
+                if op != "add" or _key(row) in already_written:
+                    continue
+                if removed.get(row['Patient_ID'].strip(), -1) < i:
+                    writer.writerow(row)
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(tmp_path, self.data_path)
+        os.remove(self.path)
+        self.signature = None
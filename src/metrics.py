@@ -0,0 +1,187 @@
+# metrics.py
+"""Opt-in timers and counters for the hot paths.
+
+Set PMS_METRICS=1 to record how often each instrumented operation ran, how
+long it took and how many rows it touched; totals are appended to
+output/metrics.csv and written to output/metrics.json at exit (PMS_METRICS_DIR
+changes the folder). Set PMS_PROFILE=file.prof to also run the instrumented
+operations under cProfile and save the stats there.
+
+Both are read at import. When neither is set, timed() hands back the function
+it was given, so instrumentation costs nothing at call time.
+"""
+import atexit
+import csv
+import datetime
+import functools
+import json
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+CSV_HEADERS = ["Time", "Name", "Calls", "Total ms", "Mean ms", "Max ms", "Rows"]
+
+
+class Metrics:
+    def __init__(self, enabled=False, folder="output", profile_path=None):
+        self.enabled = enabled or bool(profile_path)
+        self.folder = folder
+        self.profile_path = profile_path
+        self.timers = {}  # name -> [calls, total seconds, max seconds, rows or None]
+        self.counters = {}
+        self.gauges = {}  # name -> callable read when exporting
+        self.lock = threading.Lock()
+        self.profiler = None
+        self.depth = threading.local()
+        if profile_path:
+            import cProfile
+            self.profiler = cProfile.Profile()
+        if self.enabled:
+            atexit.register(self._export_at_exit)
+
+    def _entry(self, name):
+        with self.lock:
+            entry = self.timers.get(name)
+            if entry is None:
+                entry = self.timers[name] = [0, 0.0, 0.0, None]
+            return entry
+
+    def _record(self, entry, seconds, rows=None):
+        with self.lock:
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+            if rows is not None:
+                entry[3] = (entry[3] or 0) + rows
+
+    def add_time(self, name, seconds, rows=None):
+        self._record(self._entry(name), seconds, rows)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name, read):
+        """Report read() under name whenever metrics are exported."""
+        self.gauges[name] = read
+
+    @contextmanager
+    def timer(self, name):
+        """Time a block; a no-op unless metrics are enabled."""
+        if not self.enabled:
+            yield
+            return
+        self._start_profile()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+            self._stop_profile()
+
+    def timed(self, name, rows=None):
+        """Decorator timing each call under name.
+
+        rows(result, *args) gives the number of rows the call touched. When
+        metrics are disabled the function is returned unwrapped.
+        """
+        def decorate(fn):
+            if not self.enabled:
+                return fn
+            entry = self._entry(name)
+            record = self._record
+            clock = time.perf_counter
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = clock()
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException:
+                    record(entry, clock() - start)
+                    raise
+                record(entry, clock() - start, rows(result, *args) if rows else None)
+                return result
+
+            if self.profiler is None:
+                return wrapper
+
+            @functools.wraps(fn)
+            def profiled(*args, **kwargs):
+                self._start_profile()
+                try:
+                    return wrapper(*args, **kwargs)
+                finally:
+                    self._stop_profile()
+            return profiled
+        return decorate
+
+    def _start_profile(self):
+        # cProfile only follows the thread that enables it, so profile each
+        # outermost instrumented call on whichever thread runs it.
+        if self.profiler is None:
+            return
+        depth = getattr(self.depth, "value", 0)
+        self.depth.value = depth + 1
+        if depth == 0:
+            self.profiler.enable()
+
+    def _stop_profile(self):
+        if self.profiler is None:
+            return
+        self.depth.value -= 1
+        if self.depth.value == 0:
+            self.profiler.disable()
+
+    def snapshot(self):
+        """Return {'timers': {name: {...}}, 'counters': {...}, 'gauges': {...}}."""
+        with self.lock:
+            timers = {name: {"calls": calls, "total_ms": total * 1000, "mean_ms": total * 1000 / calls,
+                             "max_ms": longest * 1000, "rows": rows}
+                      for name, (calls, total, longest, rows) in sorted(self.timers.items()) if calls}
+            counters = dict(sorted(self.counters.items()))
+        gauges = {name: read() for name, read in sorted(self.gauges.items())}
+        return {"timers": timers, "counters": counters, "gauges": gauges}
+
+    def _export_at_exit(self):
+        # Worker processes (e.g. the parallel loader's) inherit PMS_METRICS and
+        # import this module too; only the main process writes the files.
+        # Checked at exit because a spawned worker imports modules before it
+        # knows its parent.
+        if multiprocessing.parent_process() is None:
+            self.export()
+
+    def export(self):
+        """Append the totals to metrics.csv, write metrics.json and save any profile."""
+        snapshot = self.snapshot()
+        now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            csv_path = os.path.join(self.folder, "metrics.csv")
+            write_header = not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0
+            with open(csv_path, "a", newline="") as f:
+                writer = csv.writer(f)
+                if write_header:
+                    writer.writerow(CSV_HEADERS)
+                for name, t in snapshot["timers"].items():
+                    writer.writerow([now, name, t["calls"], f"{t['total_ms']:.3f}", f"{t['mean_ms']:.3f}",
+                                     f"{t['max_ms']:.3f}", t["rows"]])
+                for name, value in list(snapshot["counters"].items()) + list(snapshot["gauges"].items()):
+                    writer.writerow([now, name, value, "", "", "", ""])
+            with open(os.path.join(self.folder, "metrics.json"), "w") as f:
+                json.dump(dict(snapshot, time=now), f, indent=1)
+            if self.profiler is not None:
+                self.profiler.dump_stats(self.profile_path)
+        except OSError as e:
+            print(f"Warning: could not write metrics: {e}")
+
+
+METRICS = Metrics(
+    enabled=os.environ.get("PMS_METRICS", "") not in ("", "0"),
+    folder=os.environ.get("PMS_METRICS_DIR", "output"),
+    profile_path=os.environ.get("PMS_PROFILE") or None,
+)
+timed = METRICS.timed
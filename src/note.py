@@ -1,6 +1,8 @@
 # note.py
 class Note:
     """A clinical note attached to a visit."""
+    __slots__ = ("note_id", "note_type", "visit_id", "note_text")
+
     def __init__(self, note_id, note_type=None, visit_id=None, note_text=""):
         self.note_id = note_id
         self.note_type = note_type
@@ -0,0 +1,180 @@
+# note_search.py
+import csv
+import heapq
+import json
+import math
+import os
+import re
+import sys
+from array import array
+from collections import Counter
+
+INDEX_VERSION = 2
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+
+def _signature(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+class NoteIndex:
+    """Inverted index over clinical notes with BM25 ranking.
+
+    Each note is a document numbered in file order; postings map a term to
+    parallel arrays of document numbers and term frequencies.
+    """
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.docs = []  # document number -> (patient_id, visit_id, note_id)
+        self.doc_len = array('I')
+        self.postings = {}  # term -> (array of doc numbers, array of term counts)
+        self.avg_len = 0.0
+        self.source = None
+
+    @classmethod
+    def build(cls, notes):
+        """Index an iterable of (patient_id, visit_id, note_id, text)."""
+        index = cls()
+        postings = {}
+        for patient_id, visit_id, note_id, text in notes:
+            doc = len(index.docs)
+            index.docs.append((patient_id, visit_id, note_id))
+            counts = Counter(tokenize(text))
+            index.doc_len.append(sum(counts.values()))
+            for term, tf in counts.items():
+                entry = postings.get(term)
+                if entry is None:
+                    entry = postings[term] = (array('I'), array('I'))
+                entry[0].append(doc)
+                entry[1].append(tf)
+        index.postings = postings
+        index.avg_len = sum(index.doc_len) / len(index.doc_len) if index.docs else 0.0
+        return index
+
+    @classmethod
+    def build_from_csv(cls, note_file_path):
+        """Index every note in a Notes.csv file."""
+        with open(note_file_path, 'r', newline='') as file:
+            rows = ((row['Patient_ID'].strip(), row['Visit_ID'].strip(), row['Note_ID'].strip(), row['Note_text'])
+                    for row in csv.DictReader(file))
+            index = cls.build(rows)
+        index.source = _signature(note_file_path)
+        return index
+
+    @classmethod
+    def load_or_build(cls, note_file_path):
+        """Load the index saved next to the notes file, rebuilding it if the file changed."""
+        index_path = note_file_path + ".idx"
+        try:
+            index = cls.load(index_path, _signature(note_file_path))
+            if index is not None:
+                return index
+        except (OSError, EOFError, ValueError, KeyError, TypeError):
+            pass
+        index = cls.build_from_csv(note_file_path)
+        try:
+            index.save(index_path)
+        except OSError as e:
+            print(f"Warning: could not save note index: {e}")
+        return index
+
+    @classmethod
+    def load(cls, path, source=None):
+        """Read an index written by save(); return None if it is stale or from another version.
+
+        The file holds no code: a JSON header line, a JSON line with the
+        documents and terms, then the raw arrays. Pass source (the notes
+        file's signature) to reject an index built from other contents.
+        """
+        with open(path, 'rb') as f:
+            header = json.loads(f.readline())
+            if header['version'] != INDEX_VERSION or (source is not None and tuple(header['source']) != source):
+                return None
+            if header['itemsize'] != array('I').itemsize:
+                return None
+            body = json.loads(f.readline())
+            doc_len, doc_ids, tfs = array('I'), array('I'), array('I')
+            doc_len.fromfile(f, len(body['docs']))
+            doc_ids.fromfile(f, header['postings'])
+            tfs.fromfile(f, header['postings'])
+            if f.read(1):
+                raise ValueError(f"{path} has trailing data")
+        if header['byteorder'] != sys.byteorder:
+            for arr in (doc_len, doc_ids, tfs):
+                arr.byteswap()
+        index = cls(header['k1'], header['b'])
+        index.docs = [tuple(doc) for doc in body['docs']]
+        index.doc_len = doc_len
+        index.avg_len = header['avg_len']
+        index.source = tuple(header['source'])
+        start = 0
+        for term, length in zip(body['terms'], body['lengths']):
+            end = start + length
+            index.postings[term] = (doc_ids[start:end], tfs[start:end])
+            start = end
+        if start != len(doc_ids):
+            raise ValueError(f"{path} has inconsistent postings")
+        return index
+
+    def save(self, path):
+        """Write the index atomically in the format read by load()."""
+        doc_ids, tfs = array('I'), array('I')
+        for docs, counts in self.postings.values():
+            doc_ids.extend(docs)
+            tfs.extend(counts)
+        header = {"version": INDEX_VERSION, "source": list(self.source) if self.source else None,
+                  "byteorder": sys.byteorder, "itemsize": doc_ids.itemsize, "k1": self.k1, "b": self.b,
+                  "avg_len": self.avg_len, "postings": len(doc_ids)}
+        body = {"docs": self.docs, "terms": list(self.postings),
+                "lengths": [len(docs) for docs, _ in self.postings.values()]}
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps(header).encode('utf-8') + b"\n")
+            f.write(json.dumps(body).encode('utf-8') + b"\n")
+            self.doc_len.tofile(f)
+            doc_ids.tofile(f)
+            tfs.tofile(f)
+        os.replace(tmp_path, path)
+
+    def search(self, query, limit=10, accept=None):
+        """Return [(score, patient_id, visit_id, note_id)] best first.
+
+        accept(patient_id) can filter out notes of patients no longer loaded.
+        """
+        n_docs = len(self.docs)
+        if not n_docs:
+            return []
+        avg_len = self.avg_len
+        scores = {}
+        for term in set(tokenize(query)):
+            entry = self.postings.get(term)
+            if entry is None:
+                continue
+            docs, tfs = entry
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            k1, b, doc_len = self.k1, self.b, self.doc_len
+            for doc, tf in zip(docs, tfs):
+                norm = k1 * (1 - b + b * doc_len[doc] / avg_len)
+                scores[doc] = scores.get(doc, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+        ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        results = self._accepted(ranked, limit, accept)
+        if len(results) < limit < len(scores):
+            ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            results = self._accepted(ranked, limit, accept)
+        return results
+
+    def _accepted(self, ranked, limit, accept):
+        results = []
+        for doc, score in ranked:
+            patient_id, visit_id, note_id = self.docs[doc]
+            if accept is None or accept(patient_id):
+                results.append((score, patient_id, visit_id, note_id))
+                if len(results) == limit:
+                    break
+        return results
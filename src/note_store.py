@@ -0,0 +1,111 @@
+# note_store.py
+import csv
+import mmap
+from functools import lru_cache
+
+
+def _records(mm):
+    """Yield (start, end) byte offsets of each CSV record, honouring quoted newlines."""
+    mm.seek(0)
+    start = 0
+    quotes = 0
+    while True:
+        line = mm.readline()
+        if not line:
+            break
+        quotes += line.count(b'"')
+        if quotes % 2 == 0:
+            end = mm.tell()
+            yield start, end
+            start = end
+            quotes = 0
+    if start < len(mm):
+        yield start, len(mm)  # unbalanced quote at end of file
+
+
+def _split_prefix(record, n):
+    """Split the first n fields off a CSV record; return (fields, offset of the rest)."""
+    fields = []
+    pos = 0
+    for _ in range(n):
+        if record.startswith(b'"', pos):
+            end = pos + 1
+            while True:
+                end = record.index(b'"', end)
+                if not record.startswith(b'"', end + 1):
+                    break
+                end += 2
+            fields.append(record[pos + 1:end].replace(b'""', b'"'))
+            pos = end + 2
+        else:
+            end = record.index(b',', pos)
+            fields.append(record[pos:end])
+            pos = end + 1
+    return fields, pos
+
+
+class NoteStore:
+    """Byte-range index over a memory-mapped notes CSV; text is decoded on demand."""
+    def __init__(self, path, cache_size=256):
+        self.path = path
+        self.file = open(path, 'rb')
+        try:
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self.mm = b""
+        self.text = lru_cache(maxsize=cache_size)(self._decode)
+
+    def close(self):
+        if isinstance(self.mm, mmap.mmap):
+            self.mm.close()
+        self.file.close()
+
+    def release_pages(self):
+        """Drop mapped pages touched by scan() from this process's resident set."""
+        if isinstance(self.mm, mmap.mmap) and hasattr(mmap, "MADV_DONTNEED"):
+            self.mm.madvise(mmap.MADV_DONTNEED)
+
+    def scan(self):
+        """Yield ({column: value} without Note_text, (start, end) span of Note_text)."""
+        if not self.mm:
+            return
+        records = _records(self.mm)
+        start, end = next(records)
+        header = next(csv.reader([self.mm[start:end].decode('utf-8')]))
+        if header[-1].strip() != 'Note_text':
+            raise ValueError("Note_text must be the last column for lazy loading")
+        names = [h.strip() for h in header[:-1]]
+        for start, end in records:
+            while end > start and self.mm[end - 1] in b"\r\n":
+                end -= 1
+            if end == start:
+                continue
+            head = self.mm[start:min(end, start + 4096)]
+            try:
+                values, offset = _split_prefix(head, len(names))
+            except ValueError:
+                values, offset = _split_prefix(self.mm[start:end], len(names))
+            row = {name: value.decode('utf-8').strip() for name, value in zip(names, values)}
+            yield row, (start + offset, end)
+
+    def _decode(self, span):
+        raw = self.mm[span[0]:span[1]]
+        if raw.startswith(b'"') and raw.endswith(b'"') and len(raw) > 1:
+            raw = raw[1:-1].replace(b'""', b'"')
+        return raw.decode('utf-8').strip()
+
+
+class StoredNote:
+    """A Note whose text is read from a NoteStore only when accessed."""
+    __slots__ = ("note_id", "note_type", "visit_id", "_store", "_span")
+
+    def __init__(self, store, span, note_id, visit_id=None, note_type=None):
+        self.note_id = note_id
+        self.note_type = note_type
+        self.visit_id = visit_id
+        self._store = store
+        self._span = span
+
+    @property
+    def note_text(self):
+        return self._store.text(self._span)
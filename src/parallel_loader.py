@@ -0,0 +1,134 @@
+# parallel_loader.py
+import csv
+import io
+import locale
+import mmap
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dates import parse_date
+
+# Ranges smaller than this aren't worth shipping to another process.
+MIN_RANGE_BYTES = 1 << 20
+VISIT_COLUMNS = ('Visit_ID', 'Visit_time', 'Visit_department', 'Gender', 'Race', 'Age',
+                 'Ethnicity', 'Insurance', 'Zip_code', 'Chief_complaint')
+
+
+def _count_quotes(mm, start, end, window=1 << 20):
+    return sum(mm[i:min(i + window, end)].count(b'"') for i in range(start, end, window))
+
+
+def _next_boundary(mm, boundary, pos):
+    """Return the first record boundary at or after pos, scanning on from a known boundary."""
+    size = len(mm)
+    pos = min(max(pos, boundary), size)
+    quotes = _count_quotes(mm, boundary, pos)
+    if pos > boundary and mm[pos - 1] == ord('\n') and quotes % 2 == 0:
+        return pos
+    while pos < size:
+        newline = mm.find(b'\n', pos)
+        end = size if newline == -1 else newline + 1
+        quotes += _count_quotes(mm, pos, end)
+        pos = end
+        if quotes % 2 == 0:  # not inside a quoted field
+            return pos
+    return size
+
+
+def split_ranges(path, workers):
+    """Return (header, [(start, end)]) with the file body cut at record boundaries.
+
+    A cut is only made after a newline with an even number of quotes since the
+    previous cut, so quoted fields containing newlines stay in one range.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return [], []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            body = _next_boundary(mm, 0, 1)
+            header = next(csv.reader([mm[:body].decode(locale.getpreferredencoding(False))]), [])
+            size = len(mm)
+            step = max(MIN_RANGE_BYTES, (size - body) // (workers * 4) + 1)
+            ranges = []
+            start = body
+            while start < size:
+                end = _next_boundary(mm, start, start + step)
+                ranges.append((start, end))
+                start = end
+    return header, ranges
+
+
+def parse_range(path, start, end, columns, encoding):
+    """Parse the rows in one byte range.
+
+    Returns [(patient_id, department, visit)] in file order, where visit is a
+    tuple of the remaining stripped fields with an ISO date and int age, or
+    the warning to print if the row is skipped.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode(encoding)
+    pid_col = columns['Patient_ID']
+    visit_id, time, dept, gender, race, age, ethnicity, insurance, zip_code, complaint = (
+        columns[name] for name in VISIT_COLUMNS)
+    width = max(columns.values()) + 1
+    dates = {}
+    rows = []
+    for row in csv.reader(io.StringIO(text, newline='')):
+        if not row:
+            continue
+        if len(row) < width:
+            row = row + [''] * (width - len(row))
+        pid = row[pid_col].strip()
+        dept_name = row[dept].strip()
+        raw_time = row[time].strip()
+        iso = dates.get(raw_time)
+        if iso is None:
+            try:
+                iso = dates[raw_time] = parse_date(raw_time).isoformat()
+            except ValueError:
+                rows.append((pid, dept_name, f"Warning: Unknown date format: {raw_time}"))
+                continue
+        raw_age = row[age].strip()
+        try:
+            visit_age = int(raw_age)
+        except ValueError:
+            rows.append((pid, dept_name, f"Warning: invalid age '{raw_age}' for patient {pid}; skipping record."))
+            continue
+        rows.append((pid, dept_name, (
+            row[visit_id].strip(), iso, row[gender].strip(), row[race].strip(), visit_age,
+            row[ethnicity].strip(), row[insurance].strip(), row[zip_code].strip(), row[complaint].strip())))
+    return rows
+
+
+def iter_parsed_ranges(path, workers=None):
+    """Yield parse_range results for the whole file, in file order.
+
+    Ranges are parsed by a pool of worker processes; at most two per worker
+    are in flight so parsed rows don't pile up ahead of the caller.
+    """
+    workers = workers or os.cpu_count() or 1
+    header, ranges = split_ranges(path, workers)
+    if not ranges:
+        return
+    # Last occurrence wins for a repeated column name, as with csv.DictReader.
+    columns = {name: i for i, name in enumerate(header)}
+    missing = [name for name in ('Patient_ID',) + VISIT_COLUMNS if name not in columns]
+    if missing:
+        raise KeyError(missing[0])
+    encoding = locale.getpreferredencoding(False)
+    if workers == 1 or len(ranges) == 1:
+        for start, end in ranges:
+            yield parse_range(path, start, end, columns, encoding)
+        return
+    # spawn rather than fork: the GUI and audit log have threads running.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending = deque()
+        for start, end in ranges:
+            pending.append(pool.submit(parse_range, path, start, end, columns, encoding))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
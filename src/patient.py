@@ -1,6 +1,8 @@
 # patient.py
 class Patient:
     """A patient with a list of visits and notes."""
+    __slots__ = ("patient_id", "visits", "notes")
+
     def __init__(self, patient_id):
         self.patient_id = patient_id
         self.visits = []
@@ -1,59 +1,251 @@
 # patient_management.py
 import csv
 import datetime
+import gc
 import os
-from collections import Counter
-import matplotlib.pyplot as plt
+from sys import intern
+from array import array
+from collections import defaultdict
 from note import Note
 from department import Department
 from visit import Visit
 from patient import Patient
+from visit_stats import VisitStats
+from journal import Journal
+from note_store import NoteStore, StoredNote
+from note_search import NoteIndex
+from cohort import CohortIndex
+from export import cohort_patient_ids, iter_records, patient_record, write_records, write_text
+from sqlite_store import SQLiteStore
+from columnar import ColumnarPatient, VisitColumns, VisitView, iter_column_chunks, parse_date_column
+from dates import parse_date
+from parallel_loader import iter_parsed_ranges
+from metrics import timed
 import uuid
 
 class PatientManagementSystem:
     """Handles loading, updating, and reporting on patients and visits."""
-    def __init__(self, input_path):
+    def __init__(self, input_path, loader="rows", backend="csv", workers=None):
         self.input_path = input_path
+        self.loader = loader
+        self.workers = workers  # processes for loader="parallel"; defaults to the CPU count
+        # With backend="sqlite", input_path is a database made by sqlite_store.import_csv
+        self.store = SQLiteStore(input_path) if backend == "sqlite" else None
+        self.journal = Journal(input_path)
+        self.columns = None
+        self.note_store = None
+        self.note_index = None
+        self.notes_path = None  # indexed for search_notes on its first call
+        self.version = 0  # bumped on every in-memory change; keys derived indexes
+        self._cohort = None
+        self._cohort_version = None
         self.patients = {}
         self.departments = {}
+        # date -> {patient_id: [Visit]} (row numbers with the columnar loader)
+        # and (patient_id, visit_id) -> [Note]
+        self.visits_by_date = defaultdict(dict)
+        self.notes_by_visit = defaultdict(list)
+        self.stats = VisitStats()
+        self._rendered_stats = None
         self.load_data()
 
+    @timed("load_data", rows=lambda _, self: self.version)
     def load_data(self):
-        """Load all patients and visits from the CSV file."""
+        """Load all patients and visits from the CSV file, then replay the journal."""
+        if self.store is not None:
+            return
+        if self.loader == "columnar":
+            self._load_data_columnar()
+        elif self.loader == "parallel":
+            self._load_data_parallel()
+        else:
+            try:
+                with open(self.input_path, 'r', newline='') as file:
+                    for row in csv.DictReader(file):
+                        self._load_row(row)
+            except FileNotFoundError:
+                print("Error: Data file not found.")
+        self._replay_journal()
+
+    def _load_row(self, row):
+        """Add one visit given as a CSV row dict to the in-memory model."""
+        pid = row['Patient_ID'].strip()
+        if pid not in self.patients:
+            self.patients[pid] = self._new_patient(pid)
+        built = self._visit_from_row(row, pid)
+        if built is None:
+            return
+        visit, visit_date = built
+        patient = self.patients[pid]
+        patient.add_visit(visit)
+        visit.department.add_patient(patient)
+        self.stats.add(visit)
+        # The columnar loader indexes row numbers rather than visits.
+        self._index_visit(pid, visit if self.columns is None else patient.rows[-1], visit_date)
+        self.version += 1
+
+    def _new_patient(self, pid):
+        if self.columns is not None:
+            return ColumnarPatient(pid, self.columns)
+        return Patient(pid)
+
+    def _visit_from_row(self, row, pid):
+        """Build (Visit, date) from a CSV row dict, or return None if the row is invalid."""
+        dept = row['Visit_department'].strip()
+        if dept not in self.departments:
+            self.departments[dept] = Department(dept)
+        raw_time = row['Visit_time'].strip()
         try:
-            with open(self.input_path, 'r', newline='') as file:
-                reader = csv.DictReader(file)
-                for row in reader:
-                    pid = row['Patient_ID'].strip()
+            visit_date = self._parse_date(raw_time)
+        except ValueError:
+            print(f"Warning: Unknown date format: {raw_time}")
+            return None
+        # Categorical fields repeat across rows, so share one str per value.
+        visit = Visit(
+            visit_id=row['Visit_ID'].strip(),
+            visit_date=visit_date,
+            department=self.departments[dept],
+            gender=intern(row['Gender'].strip()),
+            race=intern(row['Race'].strip()),
+            age=self._safe_int(row['Age'].strip(), pid),
+            ethnicity=intern(row['Ethnicity'].strip()),
+            insurance=intern(row['Insurance'].strip()),
+            zip_code=intern(row['Zip_code'].strip()),
+            chief_complaint=intern(row['Chief_complaint'].strip())
+        )
+        if visit.age is None:
+            return None
+        return visit, visit_date
+
+    def _replay_journal(self):
+        """Apply adds and removes recorded since the CSV was last compacted."""
+        for op, payload in self.journal.replay():
+            if op == "remove":
+                self._drop_patient(payload)
+                continue
+            patient = self.patients.get(payload['Patient_ID'].strip())
+            visit_id = payload['Visit_ID'].strip()
+            if patient and any(v.visit_id == visit_id for v in patient.visits):
+                continue  # already folded into the CSV by an interrupted compaction
+            self._load_row(payload)
+
+    def _load_data_columnar(self, chunk_size=4096):
+        """Load the CSV in chunks into column arrays.
+
+        Patients and the date index hold row numbers; a VisitView is made only
+        when a visit is read. Statistics are counted from each chunk's columns
+        rather than per visit.
+        """
+        self.columns = columns = VisitColumns()
+        ages = {}
+        parsed_dates = {}
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for chunk in iter_column_chunks(self.input_path, chunk_size):
+                dates = parse_date_column(chunk['Visit_time'], self._parse_date, parsed_dates)
+                kept, kept_dates, kept_ages, kept_depts = [], [], [], []
+                for i, pid in enumerate(chunk['Patient_ID']):
                     if pid not in self.patients:
-                        self.patients[pid] = Patient(pid)
-                    dept = row['Visit_department'].strip()
+                        self.patients[pid] = ColumnarPatient(pid, columns)
+                    dept = chunk['Visit_department'][i]
                     if dept not in self.departments:
                         self.departments[dept] = Department(dept)
-                    raw_time = row['Visit_time'].strip()
-                    try:
-                        visit_date = self._parse_date(raw_time)
-                    except ValueError:
-                        print(f"Warning: Unknown date format: {raw_time}")
+                    if dates[i] is None:
+                        print(f"Warning: Unknown date format: {chunk['Visit_time'][i]}")
                         continue
+                    raw_age = chunk['Age'][i]
+                    age = ages.get(raw_age)
+                    if age is None:
+                        age = self._safe_int(raw_age, pid)
+                        if age is None:
+                            continue
+                        ages[raw_age] = age
+                    kept.append(i)
+                    kept_dates.append(dates[i])
+                    kept_ages.append(age)
+                    kept_depts.append(self.departments[dept])
+
+                def take(name):
+                    col = chunk[name]
+                    return [col[i] for i in kept]
+
+                gender, insurance, complaint = take('Gender'), take('Insurance'), take('Chief_complaint')
+                first = columns.extend(
+                    [chunk['Visit_ID'][i] for i in kept], kept_dates, kept_depts,
+                    gender, take('Race'), kept_ages, take('Ethnicity'),
+                    insurance, take('Zip_code'), complaint
+                )
+                self.stats.add_columns(kept_dates, insurance, gender, kept_depts, complaint, kept_ages)
+                pids = chunk['Patient_ID']
+                patients = self.patients
+                visits_by_date = self.visits_by_date
+                for row, i, visit_date, department in zip(range(first, len(columns)), kept, kept_dates, kept_depts):
+                    pid = pids[i]
+                    patient = patients[pid]
+                    patient.rows.append(row)
+                    department.patients.add(patient)
+                    by_pid = visits_by_date[visit_date]
+                    rows = by_pid.get(pid)
+                    if rows is None:
+                        rows = by_pid[pid] = array('l')
+                    rows.append(row)
+                self.version += len(kept)
+                del chunk, dates
+        except FileNotFoundError:
+            print("Error: Data file not found.")
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+
+    def _load_data_parallel(self):
+        """Parse byte ranges of the CSV in worker processes and merge them in file order.
+
+        Workers do the CSV parsing, stripping, date parsing and age checks;
+        this process builds the model from their rows in the order the serial
+        loader would, printing each skipped row's warning at its position.
+        """
+        dates = {}
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for rows in iter_parsed_ranges(self.input_path, self.workers):
+                for pid, dept, fields in rows:
+                    patient = self.patients.get(pid)
+                    if patient is None:
+                        patient = self.patients[pid] = Patient(pid)
+                    department = self.departments.get(dept)
+                    if department is None:
+                        department = self.departments[dept] = Department(dept)
+                    if isinstance(fields, str):
+                        print(fields)
+                        continue
+                    visit_id, iso, gender, race, age, ethnicity, insurance, zip_code, complaint = fields
+                    visit_date = dates.get(iso)
+                    if visit_date is None:
+                        visit_date = dates[iso] = datetime.date.fromisoformat(iso)
                     visit = Visit(
-                        visit_id=row['Visit_ID'].strip(),
-                        visit_time=visit_date.isoformat(),
-                        department=self.departments[dept],
-                        gender=row['Gender'].strip(),
-                        race=row['Race'].strip(),
-                        age=self._safe_int(row['Age'].strip(), pid),
-                        ethnicity=row['Ethnicity'].strip(),
-                        insurance=row['Insurance'].strip(),
-                        zip_code=row['Zip_code'].strip(),
-                        chief_complaint=row['Chief_complaint'].strip()
+                        visit_id=visit_id,
+                        visit_date=visit_date,
+                        department=department,
+                        gender=intern(gender),
+                        race=intern(race),
+                        age=age,
+                        ethnicity=intern(ethnicity),
+                        insurance=intern(insurance),
+                        zip_code=intern(zip_code),
+                        chief_complaint=intern(complaint)
                     )
-                    if visit.age is None:
-                        continue
-                    self.patients[pid].add_visit(visit)
-                    self.departments[dept].add_patient(self.patients[pid])
+                    patient.add_visit(visit)
+                    department.add_patient(patient)
+                    self.stats.add(visit)
+                    self._index_visit(pid, visit, visit_date)
+                    self.version += 1
         except FileNotFoundError:
             print("Error: Data file not found.")
+        finally:
+            if gc_was_enabled:
+                gc.enable()
 
     def _safe_int(self, s, pid):
         """Convert string to int, or return None if invalid."""
@@ -63,8 +255,26 @@ class PatientManagementSystem:
             print(f"Warning: invalid age '{s}' for patient {pid}; skipping record.")
             return None
 
-    def load_notes(self, note_file_path):
-        """Attach notes to patients from the notes CSV."""
+    @timed("load_notes", rows=lambda _, self, *args: sum(map(len, self.notes_by_visit.values())))
+    def load_notes(self, note_file_path, lazy=True):
+        """Attach notes to patients from the notes CSV.
+
+        With lazy=True the file is memory-mapped and only byte offsets are kept;
+        note text is decoded when first read and recently read notes are cached.
+        """
+        self.notes_path = note_file_path
+        self.note_index = None
+        if self.store is not None:
+            return  # notes were imported into the database with the visits
+        if lazy:
+            try:
+                self._load_notes_lazy(note_file_path)
+                return
+            except ValueError as e:
+                print(f"Warning: {e}; loading notes eagerly.")
+            except Exception as e:
+                print(f"Error loading notes: {e}")
+                return
         try:
             with open(note_file_path, 'r', newline='') as file:
                 reader = csv.DictReader(file)
@@ -77,146 +287,254 @@ class PatientManagementSystem:
                             note_text=row['Note_text'].strip()
                         )
                         self.patients[pid].add_note(note)
+                        self.notes_by_visit[(pid, note.visit_id)].append(note)
         except Exception as e:
             print(f"Error loading notes: {e}")
 
+    def _load_notes_lazy(self, note_file_path):
+        store = NoteStore(note_file_path)
+        notes = []
+        for row, span in store.scan():
+            pid = row['Patient_ID']
+            if pid in self.patients:
+                notes.append((pid, StoredNote(store, span, note_id=row['Note_ID'], visit_id=row['Visit_ID'])))
+        store.release_pages()
+        self.note_store = store
+        for pid, note in notes:
+            self.patients[pid].add_note(note)
+            self.notes_by_visit[(pid, note.visit_id)].append(note)
+
+    def _index_visit(self, pid, visit, visit_date):
+        """Record a visit (a row number with the columnar loader) under its date in the date index."""
+        by_pid = self.visits_by_date[visit_date]
+        if pid not in by_pid:
+            by_pid[pid] = [] if self.columns is None else array('l')
+        by_pid[pid].append(visit)
+
+    def _unindex_patient(self, patient):
+        """Drop a patient's visits and notes from the indexes and statistics."""
+        pid = patient.patient_id
+        for visit in patient.visits:
+            self.stats.remove(visit)
+            visit_date = visit.visit_date
+            by_pid = self.visits_by_date.get(visit_date)
+            if by_pid is None:
+                continue
+            by_pid.pop(pid, None)
+            if not by_pid:
+                del self.visits_by_date[visit_date]
+        for note in patient.notes:
+            self.notes_by_visit.pop((pid, note.visit_id), None)
+
+    @timed("parse_date")
     def _parse_date(self, s: str) -> datetime.date:
         """Parse a date string in common formats."""
-        for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%m-%d-%Y"):
-            try:
-                return datetime.datetime.strptime(s.strip(), fmt).date()
-            except ValueError:
-                continue
-        raise ValueError(f"Unknown date format: {s!r}")
+        return parse_date(s)
 
+    @timed("review_date", rows=lambda count, *_: count)
     def review_date(self, date_str: str) -> int | None:
         """Count the number of visits on a given date."""
         try:
             target = self._parse_date(date_str)
         except ValueError:
             return None
-        count = 0
-        for patient in self.patients.values():
-            for visit in patient.visits:
-                try:
-                    vt = self._parse_date(visit.visit_time)
-                except ValueError:
-                    continue
-                if vt == target:
-                    count += 1
-        return count
+        if self.store is not None:
+            return self.store.count_visits(target)
+        by_pid = self.visits_by_date.get(target)
+        if not by_pid:
+            return 0
+        return sum(len(visits) for visits in by_pid.values())
 
+    @timed("view_note")
     def view_note(self, patient_id: str, date_str: str) -> str | None:
         """Return all notes for a patient on a specific date."""
-        if patient_id not in self.patients:
+        if self.store is not None:
+            if not self.store.has_patient(patient_id):
+                return None
+        elif patient_id not in self.patients:
             return None
         try:
             target = self._parse_date(date_str)
         except ValueError:
             return None
+        if self.store is not None:
+            results = [f"Note ID: {note_id}\n{text}" for note_id, text in self.store.notes_on(patient_id, target)]
+            return "\n\n".join(results) if results else None
         results = []
-        for visit in self.patients[patient_id].visits:
-            try:
-                vt = self._parse_date(visit.visit_time)
-            except ValueError:
-                continue
-            if vt == target:
-                for note in self.patients[patient_id].notes:
-                    if note.visit_id == visit.visit_id:
-                        results.append(f"Note ID: {note.note_id}\n{note.note_text}")
+        by_pid = self.visits_by_date.get(target, {})
+        visits = by_pid.get(patient_id, [])
+        if self.columns is not None:
+            visits = [VisitView(self.columns, row) for row in visits]
+        for visit in visits:
+            for note in self.notes_by_visit.get((patient_id, visit.visit_id), []):
+                results.append(f"Note ID: {note.note_id}\n{note.note_text}")
         return "\n\n".join(results) if results else None
 
+    @timed("search_notes", rows=lambda hits, *_: len(hits))
+    def search_notes(self, query: str, limit: int = 10) -> list:
+        """Return [(score, patient_id, visit_id, note_id)] for the best-matching notes.
+
+        The first call loads the saved full-text index, building and saving it
+        if Notes.csv has changed since.
+        """
+        if self.note_index is None:
+            if self.notes_path is None:
+                return []
+            try:
+                self.note_index = NoteIndex.load_or_build(self.notes_path)
+            except Exception as e:
+                print(f"Error indexing notes: {e}")
+                return []
+        has_patient = self.store.has_patient if self.store is not None else self.patients.__contains__
+        return self.note_index.search(query, limit, accept=has_patient)
+
+    @timed("note_text")
+    def note_text(self, patient_id: str, note_id: str) -> str | None:
+        """Return the text of one of a patient's notes."""
+        if self.store is not None:
+            return self.store.note_text(patient_id, note_id)
+        for note in self.patients[patient_id].notes if patient_id in self.patients else []:
+            if note.note_id == note_id:
+                return note.note_text
+        return None
+
+    def iter_visits(self):
+        """Yield (patient_id, visit) for every visit."""
+        if self.store is not None:
+            yield from self.store.iter_visits()
+            return
+        for pid, patient in self.patients.items():
+            for visit in patient.visits:
+                yield pid, visit
+
+    @timed("cohort_index")
+    def _cohort_index(self):
+        """Return the cohort bitmap index, rebuilding it if the data changed."""
+        version = self.store.version() if self.store is not None else self.version
+        if self._cohort is None or self._cohort_version != version:
+            self._cohort = CohortIndex(self.iter_visits())
+            self._cohort_version = version
+        return self._cohort
+
+    def _date_range(self, date_from, date_to):
+        """Parse optional date bounds to dates; raises ValueError."""
+        return (self._parse_date(date_from) if date_from else None,
+                self._parse_date(date_to) if date_to else None)
+
+    @timed("cohort_count", rows=lambda count, *_: count)
+    def cohort_count(self, filters: dict, date_from: str = None, date_to: str = None) -> int:
+        """Count visits matching every field in filters (field -> value or list of values).
+
+        Fields are those in cohort.FIELDS; dates are inclusive and may be omitted.
+        """
+        return self._cohort_index().count(filters, *self._date_range(date_from, date_to))
+
+    def cohort(self, filters: dict, date_from: str = None, date_to: str = None):
+        """Yield (patient_id, visit) for visits matching filters, in date order."""
+        return self._cohort_index().select(filters, *self._date_range(date_from, date_to))
+
+    @timed("get_patient")
+    def get_patient(self, patient_id: str):
+        """Return the Patient with its visits and notes, or None."""
+        if self.store is not None:
+            return self.store.get_patient(patient_id)
+        return self.patients.get(patient_id)
+
+    @timed("retrieve_patient")
     def retrieve_patient(self, patient_id: str, output_file: str) -> bool:
-        """Write all info for a patient to an output file."""
-        if patient_id not in self.patients:
+        """Write all info for a patient to an output file, notes grouped under their visits."""
+        patient = self.get_patient(patient_id)
+        if patient is None:
             return False
-        patient = self.patients[patient_id]
         try:
             with open(output_file, 'w') as f:
-                f.write(f"Patient ID: {patient.patient_id}\n")
-                for visit in patient.visits:
-                    f.write(f"Visit ID: {visit.visit_id}, Date: {visit.visit_time}, Dept: {visit.department.name}, Chief Complaint: {visit.chief_complaint}\n")
-                for note in patient.notes:
-                    f.write(f"Note ID: {note.note_id}, Text: {note.note_text}\n")
+                write_text(f, patient_record(patient))
             return True
-        except:
+        except OSError:
             return False
 
+    @timed("export_patients", rows=lambda count, *_: count)
+    def export_patients(self, output_file, patient_ids=None, filters=None, date_from=None, date_to=None,
+                        fmt=None, compress=None) -> int:
+        """Stream many patients to one file; returns the number exported.
+
+        Exports patient_ids if given, otherwise every patient with a visit
+        matching the cohort filters (see cohort_count). fmt is 'text', 'csv'
+        or 'jsonl' (guessed from the file name by default) and a '.gz' name
+        is gzipped.
+        """
+        if patient_ids is None:
+            patient_ids = cohort_patient_ids(self, filters or {}, date_from, date_to)
+        return write_records(iter_records(self, patient_ids), output_file, fmt, compress)
+
+    @timed("add_visit")
     def add_visit_gui(self, patient_id, visit_time, dept_name, gender, race, age, ethnicity, insurance, zip_code, complaint):
         """Add a new visit from the UI."""
-        pid = patient_id.strip()
-        if pid not in self.patients:
-            self.patients[pid] = Patient(pid)
-        if dept_name not in self.departments:
-            self.departments[dept_name] = Department(dept_name)
-        visit = Visit(
-            visit_id=str(uuid.uuid4())[:8],
-            visit_time=visit_time,
-            department=self.departments[dept_name],
-            gender=gender, race=race, age=int(age),
-            ethnicity=ethnicity, insurance=insurance,
-            zip_code=zip_code, chief_complaint=complaint
-        )
-        self.patients[pid].add_visit(visit)
-        self.departments[dept_name].add_patient(self.patients[pid])
-        fieldnames = [
-            'Patient_ID','Visit_ID','Visit_time','Visit_department',
-            'Gender','Race','Age','Ethnicity',
-            'Insurance','Zip_code','Chief_complaint'
-        ]
-        with open(self.input_path, 'a', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writerow({
-                'Patient_ID': pid,
-                'Visit_ID': visit.visit_id,
-                'Visit_time': visit_time,
-                'Visit_department': dept_name,
-                'Gender': gender,
-                'Race': race,
-                'Age': age,
-                'Ethnicity': ethnicity,
-                'Insurance': insurance,
-                'Zip_code': zip_code,
-                'Chief_complaint': complaint
-            })
+        row = {
+            'Patient_ID': patient_id.strip(),
+            'Visit_ID': str(uuid.uuid4())[:8],
+            'Visit_time': visit_time,
+            'Visit_department': dept_name,
+            'Gender': gender,
+            'Race': race,
+            'Age': str(int(age)),
+            'Ethnicity': ethnicity,
+            'Insurance': insurance,
+            'Zip_code': zip_code,
+            'Chief_complaint': complaint
+        }
+        if self.store is not None:
+            pid = row['Patient_ID']
+            self.store.add_patient(pid)
+            built = self._visit_from_row(row, pid)
+            if built is not None:
+                self.store.add_visit(pid, built[0])
+            return
+        self.journal.append_add(row)
+        self._load_row(row)
 
+    @timed("remove_patient")
     def remove_patient(self, patient_id: str):
         """Remove a patient and their visits from the data."""
         pid = patient_id.strip()
+        if self.store is not None:
+            self.store.remove_patient(pid)
+            return
+        self.journal.append_remove(pid)
+        self._drop_patient(pid)
+
+    def _drop_patient(self, pid):
+        """Remove a patient from the in-memory model."""
         if pid in self.patients:
+            self._unindex_patient(self.patients[pid])
             del self.patients[pid]
-        with open(self.input_path, 'r', newline='') as f:
-            rows = list(csv.DictReader(f))
-        with open(self.input_path, 'w', newline='') as f:
-            fieldnames = rows[0].keys() if rows else []
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for row in rows:
-                if row['Patient_ID'].strip() != pid:
-                    writer.writerow(row)
+            self.version += 1
 
+    @timed("compact")
+    def compact(self):
+        """Rewrite the data CSV with all journaled changes applied."""
+        if self.store is None:
+            self.journal.compact()
+
+    @timed("generate_statistics")
     def generate_statistics(self):
         """Create and save charts for visit and demographic statistics."""
-        date_counter = Counter()
-        insurance_counter = Counter()
-        gender_counter = Counter()
-        department_counter = Counter()
-        complaint_counter = Counter()
-        age_groups = {"Child": 0, "Adult": 0, "Senior": 0}
-
-        def age_group(a):
-            return "Child" if a < 18 else "Adult" if a < 65 else "Senior"
+        chart_path = "output/visit_stats.png"
+        stats = self.store.stats() if self.store is not None else self.stats
+        snapshot = stats.snapshot()
+        if snapshot == self._rendered_stats and os.path.exists(chart_path):
+            print("Statistics unchanged; chart in visit_stats.png is current.")
+            return
+        date_counter = stats.by_date
+        insurance_counter = stats.by_insurance
+        gender_counter = stats.by_gender
+        age_groups = stats.by_age_group
 
-        for patient in self.patients.values():
-            for visit in patient.visits:
-                date_counter[visit.visit_time] += 1
-                insurance_counter[visit.insurance] += 1
-                gender_counter[visit.gender] += 1
-                department_counter[visit.department.name] += 1
-                complaint_counter[visit.chief_complaint.lower()] += 1
-                age_groups[age_group(visit.age)] += 1
-
-        fig, axs = plt.subplots(2, 2, figsize=(14, 10))
+        # Imported here so nothing else pays for matplotlib. The object-oriented
+        # Figure API needs no GUI backend, so this is safe off the Tk thread.
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(14, 10))
+        axs = fig.subplots(2, 2)
         fig.suptitle("Hospital Visit Statistics", fontsize=18)
 
         dates, counts = zip(*sorted(date_counter.items()))
@@ -241,7 +559,7 @@ class PatientManagementSystem:
         axs[1, 1].set_title("Age Group Distribution")
         axs[1, 1].grid(axis="y", linestyle="--", alpha=0.5)
 
-        plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-        plt.savefig("output/visit_stats.png")
-        plt.close(fig)
+        fig.tight_layout(rect=[0, 0.03, 1, 0.95])
+        fig.savefig(chart_path)
+        self._rendered_stats = snapshot
         print("Chart saved to visit_stats.png.")
@@ -0,0 +1,196 @@
+# sqlite_store.py
+import sqlite3
+import sys
+import threading
+from dates import parse_date
+from department import Department
+from note import Note
+from patient import Patient
+from visit import Visit
+from visit_stats import VisitStats, age_group
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS patients (
+    patient_id TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS visits (
+    patient_id TEXT NOT NULL,
+    visit_id TEXT NOT NULL,
+    visit_time TEXT NOT NULL,
+    department TEXT NOT NULL,
+    gender TEXT,
+    race TEXT,
+    age INTEGER NOT NULL,
+    ethnicity TEXT,
+    insurance TEXT,
+    zip_code TEXT,
+    chief_complaint TEXT
+);
+CREATE TABLE IF NOT EXISTS notes (
+    patient_id TEXT NOT NULL,
+    visit_id TEXT NOT NULL,
+    note_id TEXT NOT NULL,
+    note_text TEXT
+);
+CREATE INDEX IF NOT EXISTS visits_patient_id ON visits (patient_id);
+CREATE INDEX IF NOT EXISTS visits_visit_time ON visits (visit_time);
+CREATE INDEX IF NOT EXISTS visits_department ON visits (department);
+CREATE INDEX IF NOT EXISTS visits_visit_id ON visits (visit_id);
+CREATE INDEX IF NOT EXISTS notes_patient_visit ON notes (patient_id, visit_id);
+"""
+
+VISIT_COLUMNS = ("visit_id", "visit_time", "department", "gender", "race", "age",
+                 "ethnicity", "insurance", "zip_code", "chief_complaint")
+
+
+def _visit(row, departments):
+    """Build a Visit from a row of VISIT_COLUMNS, sharing Department objects by name."""
+    fields = dict(zip(VISIT_COLUMNS, row))
+    name = fields["department"]
+    fields["department"] = departments.setdefault(name, Department(name))
+    fields["visit_date"] = parse_date(fields.pop("visit_time"))
+    return Visit(**fields)
+
+
+class SQLiteStore:
+    """Patients, visits and notes kept in an indexed SQLite database."""
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def has_patient(self, patient_id):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM patients WHERE patient_id = ?", (patient_id,)).fetchone()
+        return row is not None
+
+    def count_visits(self, visit_date):
+        with self.lock:
+            (count,) = self.conn.execute(
+                "SELECT COUNT(*) FROM visits WHERE visit_time = ?",
+                (visit_date.isoformat(),)).fetchone()
+        return count
+
+    def notes_on(self, patient_id, visit_date):
+        """Return (note_id, note_text) for the patient's notes on a date, in visit order."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT n.note_id, n.note_text FROM visits v"
+                " JOIN notes n ON n.patient_id = v.patient_id AND n.visit_id = v.visit_id"
+                " WHERE v.patient_id = ? AND v.visit_time = ?"
+                " ORDER BY v.rowid, n.rowid",
+                (patient_id, visit_date.isoformat())).fetchall()
+
+    def note_text(self, patient_id, note_id):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT note_text FROM notes WHERE patient_id = ? AND note_id = ?",
+                (patient_id, note_id)).fetchone()
+        return row[0] if row else None
+
+    def get_patient(self, patient_id):
+        """Build a Patient with its visits and notes, or return None."""
+        if not self.has_patient(patient_id):
+            return None
+        patient = Patient(patient_id)
+        departments = {}
+        with self.lock:
+            visit_rows = self.conn.execute(
+                f"SELECT {', '.join(VISIT_COLUMNS)} FROM visits WHERE patient_id = ? ORDER BY rowid",
+                (patient_id,)).fetchall()
+            note_rows = self.conn.execute(
+                "SELECT note_id, visit_id, note_text FROM notes WHERE patient_id = ? ORDER BY rowid",
+                (patient_id,)).fetchall()
+        for row in visit_rows:
+            patient.add_visit(_visit(row, departments))
+        for note_id, visit_id, note_text in note_rows:
+            patient.add_note(Note(note_id=note_id, visit_id=visit_id, note_text=note_text))
+        return patient
+
+    def iter_visits(self):
+        """Yield (patient_id, Visit) for every visit."""
+        departments = {}
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT patient_id, {', '.join(VISIT_COLUMNS)} FROM visits ORDER BY rowid").fetchall()
+        for row in rows:
+            yield row[0], _visit(row[1:], departments)
+
+    def version(self):
+        """A number that changes whenever this connection modifies the database."""
+        return self.conn.total_changes
+
+    def add_patient(self, patient_id):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO patients VALUES (?)", (patient_id,))
+
+    def add_visit(self, patient_id, visit):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO patients VALUES (?)", (patient_id,))
+            self.conn.execute(
+                "INSERT INTO visits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (patient_id, visit.visit_id, visit.visit_time, visit.department.name,
+                 visit.gender, visit.race, visit.age, visit.ethnicity,
+                 visit.insurance, visit.zip_code, visit.chief_complaint))
+
+    def remove_patient(self, patient_id):
+        with self.lock, self.conn:
+            for table in ("notes", "visits", "patients"):
+                self.conn.execute(f"DELETE FROM {table} WHERE patient_id = ?", (patient_id,))
+
+    def stats(self):
+        """Compute VisitStats with GROUP BY queries instead of walking visits."""
+        stats = VisitStats()
+        with self.lock:
+            for column, counter in (("visit_time", stats.by_date),
+                                    ("insurance", stats.by_insurance),
+                                    ("gender", stats.by_gender),
+                                    ("department", stats.by_department)):
+                for key, count in self.conn.execute(
+                        f"SELECT {column}, COUNT(*) FROM visits GROUP BY {column}"):
+                    counter[key] = count
+            for complaint, count in self.conn.execute(
+                    "SELECT chief_complaint, COUNT(*) FROM visits GROUP BY chief_complaint"):
+                stats.by_complaint[complaint.lower()] += count
+            for age, count in self.conn.execute("SELECT age, COUNT(*) FROM visits GROUP BY age"):
+                stats.by_age_group[age_group(age)] += count
+        return stats
+
+    def import_system(self, system):
+        """Replace the database contents with a loaded PatientManagementSystem."""
+        with self.lock, self.conn:
+            for table in ("notes", "visits", "patients"):
+                self.conn.execute(f"DELETE FROM {table}")
+            self.conn.executemany(
+                "INSERT INTO patients VALUES (?)", ((pid,) for pid in system.patients))
+            self.conn.executemany(
+                "INSERT INTO visits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((pid, v.visit_id, v.visit_time, v.department.name, v.gender, v.race, v.age,
+                  v.ethnicity, v.insurance, v.zip_code, v.chief_complaint)
+                 for pid, patient in system.patients.items() for v in patient.visits))
+            self.conn.executemany(
+                "INSERT INTO notes VALUES (?, ?, ?, ?)",
+                ((pid, n.visit_id, n.note_id, n.note_text)
+                 for pid, patient in system.patients.items() for n in patient.notes))
+
+
+def import_csv(data_path, notes_path, db_path):
+    """One-shot conversion of Patient_data.csv and Notes.csv into a SQLite database."""
+    from patient_management import PatientManagementSystem
+    system = PatientManagementSystem(data_path)
+    system.load_notes(notes_path)
+    store = SQLiteStore(db_path)
+    store.import_system(system)
+    store.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        print("Usage: python sqlite_store.py <Patient_data.csv> <Notes.csv> <output.db>")
+        sys.exit(1)
+    import_csv(*sys.argv[1:])
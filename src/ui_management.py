@@ -3,30 +3,38 @@ import datetime
 import os
 import tkinter as tk
 from tkinter import simpledialog, messagebox
-import csv
-from patient_management import PatientManagementSystem
+from concurrent.futures import ThreadPoolExecutor
+from dataset_cache import shared_cache
+from credentials import CredentialStore
+from audit_log import AuditLogger
+from cohort import parse_filters
+from metrics import timed
+
+POLL_MS = 50
 
 class PatientManagementApp:
     """Tkinter GUI for login and patient management."""
     def __init__(self, root):
         self.root = root
         self.root.title("Patient Management Login")
-        self.credentials = self.load_credentials("data/Credentials.csv")
+        self.credentials = CredentialStore(os.environ.get("PMS_CREDENTIALS", "data/Credentials.csv"))
         self.system = None
+        self.system_future = None
+        # One worker keeps the model single-threaded while the UI stays responsive.
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending = 0
+        self.session = 0  # bumped on logout so late results don't reach the next user
+        self.status_label = None
+        self.cache_label = None
+        self.audit_log = AuditLogger(
+            "output/usage_log.csv", ["Username", "Role", "Action", "Login Time", "Action Time"]
+        )
         self.username = None
         self.login_time = None
+        self.action = None
         self.role = None
         self.init_login()
 
-    def load_credentials(self, path):
-        """Load credentials from CSV."""
-        creds = {}
-        with open(path, newline='') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                creds[row['username']] = (row['password'], row['role'])
-        return creds
-
     def init_login(self):
         """Show login form."""
         for widget in self.root.winfo_children():
@@ -43,13 +51,15 @@ class PatientManagementApp:
         """Validate credentials and load menu."""
         username = self.username_entry.get().strip()
         password = self.password_entry.get().strip()
-        if username in self.credentials and self.credentials[username][0] == password:
+        role = self.credentials.authenticate(username, password)
+        if role is not None:
             self.username = username
             self.login_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.role = self.credentials[username][1]
-            self.system = PatientManagementSystem("data/Patient_data.csv")
-            self.system.load_notes("data/Notes.csv")
+            self.role = role
+            self.system = None
+            self.system_future = self.executor.submit(shared_cache.get, "data/Patient_data.csv", "data/Notes.csv")
             self.show_menu()
+            self.track(self.system_future, "Loading patient data...", self.on_data_loaded)
         else:
             messagebox.showerror("Login Failed", "Invalid username or password")
 
@@ -58,24 +68,94 @@ class PatientManagementApp:
         for widget in self.root.winfo_children():
             widget.destroy()
         if self.role in ("admin", "management"):
-            actions = ["Generate Statistics", "Count Visits", "Exit"]
+            actions = ["Generate Statistics", "Count Visits", "Cohort Count", "Log Out", "Exit"]
         else:
-            actions = ["Retrieve Patient", "Add Patient", "Remove Patient", "Count Visits", "View Note", "Exit"]
+            actions = ["Retrieve Patient", "Add Patient", "Remove Patient", "Count Visits", "View Note", "Search Notes",
+                       "Log Out", "Exit"]
         for action in actions:
             tk.Button(self.root, text=action, width=25, command=lambda a=action: self.execute_action(a)).pack(pady=5)
+        self.status_label = tk.Label(self.root, text="", fg="blue")
+        self.status_label.pack(pady=5)
+        self.cache_label = tk.Label(self.root, text=shared_cache.summary(), fg="gray")
+        self.cache_label.pack(pady=5)
+        self.set_busy("Working..." if self.pending else None)
+
+    def on_data_loaded(self, system):
+        """Keep the loaded model once the background load finishes."""
+        self.system = system
+        if self.cache_label is not None:
+            self.cache_label.config(text=shared_cache.summary())
+
+    def set_busy(self, text):
+        """Show or clear the busy indicator."""
+        self.root.config(cursor="watch" if text else "")
+        if self.status_label is not None:
+            self.status_label.config(text=text or "")
+
+    def track(self, future, busy_text, on_done=None):
+        """Show busy_text until future finishes, then call on_done(result) on the UI thread."""
+        self.pending += 1
+        self.set_busy(busy_text)
+        self.root.after(POLL_MS, self._poll, future, on_done, self.session)
+
+    def _poll(self, future, on_done, session):
+        if not future.done():
+            self.root.after(POLL_MS, self._poll, future, on_done, session)
+            return
+        self.pending -= 1
+        if not self.pending:
+            self.set_busy(None)
+        if session != self.session:
+            return  # started by a user who has since logged out
+        try:
+            result = future.result()
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            return
+        if on_done is not None:
+            on_done(result)
+
+    def run_in_background(self, busy_text, work, on_done=None):
+        """Run work(system) on the worker thread once the data has loaded."""
+        work = timed(f"action.{self.action}")(work)
+        loaded = self.system_future
+        self.track(self.executor.submit(lambda: work(loaded.result())), busy_text, on_done)
+
+    def save_changes(self):
+        """Fold journaled changes into the data CSV (runs on the worker thread).
+
+        Returns an error message instead of raising, so Exit still quits.
+        """
+        try:
+            if self.system_future is not None and self.system_future.exception() is None:
+                self.system_future.result().compact()
+        except Exception as e:
+            return f"Could not save changes ({e}). They are kept in the journal and applied on the next load."
+        return None
+
+    def log_out(self):
+        """Return to the login form; the loaded data stays in shared_cache for the next login."""
+        self.session += 1
+        self.username = None
+        self.login_time = None
+        self.role = None
+        self.system = None
+        self.system_future = None
+        self.status_label = None
+        self.cache_label = None
+        self.init_login()
+
+    def quit_app(self, error=None):
+        if error:
+            messagebox.showerror("Error", error)
+        self.audit_log.close()
+        self.executor.shutdown(wait=False)
+        self.root.quit()
 
     def log_action(self, action_name):
-        """Log user actions to a CSV file."""
-        log_file = "output/usage_log.csv"
-        headers = ["Username", "Role", "Action", "Login Time", "Action Time"]
+        """Queue a user action for the usage log CSV."""
         action_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        row = [self.username, self.role, action_name, self.login_time, action_time]
-        write_header = not os.path.exists(log_file)
-        with open(log_file, "a", newline="") as f:
-            writer = csv.writer(f)
-            if write_header:
-                writer.writerow(headers)
-            writer.writerow(row)
+        self.audit_log.log([self.username, self.role, action_name, self.login_time, action_time])
 
     def display_result(self, text):
         """Show result in a popup window."""
@@ -89,11 +169,17 @@ class PatientManagementApp:
     def execute_action(self, action):
         """Handle menu actions."""
         self.log_action(action)
-        if action == "Exit":
-            self.root.quit()
+        self.action = action  # names the metrics timer for run_in_background
+        if action == "Log Out":
+            self.log_out()
+        elif action == "Exit":
+            self.track(self.executor.submit(timed("action.Exit")(self.save_changes)), "Saving changes...", self.quit_app)
         elif action == "Generate Statistics":
-            self.system.generate_statistics()
-            self.display_result("Statistics chart saved to visit_stats.png")
+            self.run_in_background(
+                "Generating statistics...",
+                lambda system: system.generate_statistics(),
+                lambda _: self.display_result("Statistics chart saved to visit_stats.png")
+            )
         elif action == "Count Visits":
             date = simpledialog.askstring("Date", "Enter date (YYYY-MM-DD):")
             if not date:
@@ -103,16 +189,23 @@ class PatientManagementApp:
             except ValueError:
                 dt = datetime.datetime.strptime(date.strip(), "%m/%d/%Y")
             date_str = dt.strftime("%Y-%m-%d")
-            count = self.system.review_date(date_str) or 0
-            self.display_result(f"Total visits on {date_str}: {count}")
+            self.run_in_background(
+                "Counting visits...",
+                lambda system: system.review_date(date_str) or 0,
+                lambda count: self.display_result(f"Total visits on {date_str}: {count}")
+            )
         elif action == "Retrieve Patient":
             pid = simpledialog.askstring("Retrieve", "Enter Patient ID:")
             if not pid:
                 return
             out = "output/output.txt"
-            ok = self.system.retrieve_patient(pid, out)
-            data = open(out).read() if ok else f"Patient {pid} not found."
-            self.display_result(data)
+
+            def retrieve(system):
+                if not system.retrieve_patient(pid, out):
+                    return f"Patient {pid} not found."
+                with open(out) as f:
+                    return f.read()
+            self.run_in_background("Retrieving patient...", retrieve, self.display_result)
         elif action == "Add Patient":
             pid = simpledialog.askstring("Add Patient", "Enter Patient ID:")
             if not pid:
@@ -131,18 +224,24 @@ class PatientManagementApp:
             except:
                 self.display_result("Invalid date. Use YYYY-MM-DD.")
                 return
-            self.system.add_visit_gui(
-                pid, vt.strip(), dept.strip(), gender.strip(),
-                race.strip(), age, ethnicity.strip(),
-                insurance.strip(), zip_code.strip(), complaint.strip()
+            self.run_in_background(
+                "Adding visit...",
+                lambda system: system.add_visit_gui(
+                    pid, vt.strip(), dept.strip(), gender.strip(),
+                    race.strip(), age, ethnicity.strip(),
+                    insurance.strip(), zip_code.strip(), complaint.strip()
+                ),
+                lambda _: self.display_result(f"Added visit for {pid} on {vt}.")
             )
-            self.display_result(f"Added visit for {pid} on {vt}.")
         elif action == "Remove Patient":
             pid = simpledialog.askstring("Remove", "Enter Patient ID:")
             if not pid:
                 return
-            self.system.remove_patient(pid)
-            self.display_result(f"Removed patient {pid}.")
+            self.run_in_background(
+                "Removing patient...",
+                lambda system: system.remove_patient(pid),
+                lambda _: self.display_result(f"Removed patient {pid}.")
+            )
         elif action == "View Note":
             pid = simpledialog.askstring("View Note", "Enter Patient ID:")
             date = simpledialog.askstring("View Note", "Enter Date (YYYY-MM-DD):")
@@ -153,8 +252,45 @@ class PatientManagementApp:
             except ValueError:
                 dt = datetime.datetime.strptime(date.strip(), "%m/%d/%Y")
             ds = dt.strftime("%Y-%m-%d")
-            note = self.system.view_note(pid, ds)
-            self.display_result(note or f"No notes on {ds} for {pid}.")
+            self.run_in_background(
+                "Looking up notes...",
+                lambda system: system.view_note(pid, ds),
+                lambda note: self.display_result(note or f"No notes on {ds} for {pid}.")
+            )
+        elif action == "Cohort Count":
+            text = simpledialog.askstring(
+                "Cohort Count",
+                "Enter filters, e.g.\ninsurance=Medicare; department=Cardiology; age_group=Senior;\n"
+                "chief_complaint=chest pain; from=2015-01-01; to=2018-12-31\n"
+                "Use | between alternatives (gender=Male|Female)."
+            )
+            if not text:
+                return
+            try:
+                filters, date_from, date_to = parse_filters(text)
+            except ValueError as e:
+                self.display_result(str(e))
+                return
+            self.run_in_background(
+                "Counting cohort...",
+                lambda system: system.cohort_count(filters, date_from, date_to),
+                lambda count: self.display_result(f"Visits matching {text.strip()}: {count}")
+            )
+        elif action == "Search Notes":
+            query = simpledialog.askstring("Search Notes", "Enter search terms:")
+            if not query:
+                return
+
+            def search(system):
+                hits = system.search_notes(query)
+                if not hits:
+                    return f"No notes match '{query}'."
+                lines = []
+                for score, pid, visit_id, note_id in hits:
+                    text = " ".join((system.note_text(pid, note_id) or "").split())
+                    lines.append(f"Patient {pid}, Visit {visit_id}, Note {note_id} (score {score:.2f})\n{text[:200]}")
+                return "\n\n".join(lines)
+            self.run_in_background("Searching notes...", search, self.display_result)
 
 if __name__ == "__main__":
     root = tk.Tk()
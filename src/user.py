@@ -7,9 +7,9 @@ class User:
 
     def can_perform(self, action):
         permissions = {
-            'admin': ['count_visits'],
-            'clinician': ['add_patient', 'remove_patient', 'retrieve_patient', 'view_note', 'count_visits'],
-            'nurse': ['add_patient', 'remove_patient', 'retrieve_patient', 'view_note', 'count_visits'],
-            'management': ['generate_statistics']
+            'admin': ['count_visits', 'cohort_count', 'generate_statistics'],
+            'clinician': ['add_patient', 'remove_patient', 'retrieve_patient', 'view_note', 'search_notes', 'count_visits'],
+            'nurse': ['add_patient', 'remove_patient', 'retrieve_patient', 'view_note', 'search_notes', 'count_visits'],
+            'management': ['generate_statistics', 'cohort_count']
         }
         return action in permissions.get(self.role, [])
@@ -1,13 +1,19 @@
 # utils.py
-import csv
+from credentials import CredentialStore
+
+_stores = {}
+
+
 def authenticate(username, password, path="data/Credentials.csv"):
     """Return user role if credentials match, else None."""
+    store = _stores.get(path)
     try:
-        with open(path, newline='') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                if row['username'] == username and row['password'] == password:
-                    return row['role']
+        if store is None:
+            store = _stores[path] = CredentialStore(path)
+        else:
+            store.reload_if_changed()
     except FileNotFoundError:
+        _stores.pop(path, None)
         print("Credential file not found.")
-    return None
+        return None
+    return store.authenticate(username, password)
@@ -1,9 +1,12 @@
 # visit.py
 class Visit:
-    """Stores details of a patient visit."""
-    def __init__(self, visit_id, visit_time, department, gender, race, age, ethnicity, insurance, zip_code, chief_complaint):
+    """Stores details of a patient visit; visit_date is a datetime.date."""
+    __slots__ = ("visit_id", "visit_date", "department", "gender", "race", "age",
+                 "ethnicity", "insurance", "zip_code", "chief_complaint")
+
+    def __init__(self, visit_id, visit_date, department, gender, race, age, ethnicity, insurance, zip_code, chief_complaint):
         self.visit_id = visit_id
-        self.visit_time = visit_time
+        self.visit_date = visit_date
         self.department = department
         self.gender = gender
         self.race = race
@@ -12,3 +15,8 @@ class Visit:
         self.insurance = insurance
         self.zip_code = zip_code
         self.chief_complaint = chief_complaint
+
+    @property
+    def visit_time(self):
+        """The visit date as an ISO string (YYYY-MM-DD)."""
+        return self.visit_date.isoformat()
@@ -0,0 +1,68 @@
+# visit_stats.py
+from collections import Counter
+
+
+def age_group(age):
+    return "Child" if age < 18 else "Adult" if age < 65 else "Senior"
+
+
+class VisitStats:
+    """Running visit counts, kept up to date as visits are added and removed."""
+    __slots__ = ("by_date", "by_insurance", "by_gender", "by_department", "by_complaint", "by_age_group")
+
+    def __init__(self):
+        self.by_date = Counter()
+        self.by_insurance = Counter()
+        self.by_gender = Counter()
+        self.by_department = Counter()
+        self.by_complaint = Counter()
+        self.by_age_group = {"Child": 0, "Adult": 0, "Senior": 0}
+
+    @classmethod
+    def from_patients(cls, patients):
+        """Build the counts from scratch by walking every visit."""
+        stats = cls()
+        for patient in patients.values():
+            for visit in patient.visits:
+                stats.add(visit)
+        return stats
+
+    def _keys(self, visit):
+        return (
+            (self.by_date, visit.visit_time),
+            (self.by_insurance, visit.insurance),
+            (self.by_gender, visit.gender),
+            (self.by_department, visit.department.name),
+            (self.by_complaint, visit.chief_complaint.lower()),
+        )
+
+    def add(self, visit):
+        for counter, key in self._keys(visit):
+            counter[key] += 1
+        self.by_age_group[age_group(visit.age)] += 1
+
+    def add_columns(self, visit_dates, insurance, gender, departments, complaints, ages):
+        """Count a batch of visits given as equal-length column sequences.
+
+        Equivalent to add() for each visit, but counts each column in one pass
+        so the columnar loader doesn't build a visit object per count.
+        """
+        iso = {d: d.isoformat() for d in set(visit_dates)}
+        self.by_date.update(map(iso.__getitem__, visit_dates))
+        self.by_insurance.update(insurance)
+        self.by_gender.update(gender)
+        self.by_department.update(d.name for d in departments)
+        self.by_complaint.update(map(str.lower, complaints))
+        for age, n in Counter(ages).items():
+            self.by_age_group[age_group(age)] += n
+
+    def remove(self, visit):
+        for counter, key in self._keys(visit):
+            counter[key] -= 1
+            if counter[key] <= 0:
+                del counter[key]
+        self.by_age_group[age_group(visit.age)] -= 1
+
+    def snapshot(self):
+        """Return a copy of all counts that compares equal iff the counts match."""
+        return tuple(dict(getattr(self, name)) for name in self.__slots__)